@@ -11,7 +11,7 @@ from urllib.parse import urlencode
 from django.apps import apps
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.db.models import Prefetch, Q, Sum, Case, When, F, Value, DecimalField, Count, ExpressionWrapper
+from django.db.models import Prefetch, Q, Sum, Case, When, F, Value, DecimalField, Count, ExpressionWrapper, Max
 from django.db.models.functions import Coalesce
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.middleware.csrf import get_token
@@ -674,7 +674,10 @@ def _compute_opening_before_date_for_party(
 # Unified Ledger Aggregation (Helper)
 # =========================
 # MOVED TO barkat.services.balance_service
-from barkat.services.balance_service import get_party_balances
+from barkat.services.balance_service import get_party_balances, get_cached_party_net_balances
+
+# Party columns the balance-list templates read; everything else stays deferred
+_PARTY_ROW_FIELDS = ("id", "display_name", "type", "phone")
 
 
 
@@ -798,7 +801,7 @@ class LedgersListView(View):
                 # Use live calculation for accuracy in the list (Single Version of Truth)
                 # This bypasses potential stale cached_balance values
                 bals = get_party_balances(
-                    Party.objects.filter(id__in=p_ids), 
+                    Party.objects.filter(id__in=p_ids).only("id"), 
                     business_id=business.id if business else None
                 )
                 bal_map = {b.id: (b.net_balance or Decimal("0.00")) for b in bals}
@@ -877,7 +880,7 @@ def _compute_party_balance(
     """
     Returns (balance_amount, balance_side) for a party using optimized service.
     """
-    qs = Party.objects.filter(pk=party_id)
+    qs = Party.objects.filter(pk=party_id).only("id")
     # Use optimized service
     bals = get_party_balances(qs, business_id=business.id if business else None)
     
@@ -1630,7 +1633,7 @@ def party_balance_api(request):
             except ValueError:
                 pass
 
-        qs = Party.objects.filter(pk=party_id)
+        qs = Party.objects.filter(pk=party_id).only("id")
         qs = get_party_balances(
             qs, 
             business_id=business_id,
@@ -1731,13 +1734,12 @@ class PartySummaryView(View):
 
         party_qs = party_qs.order_by("display_name", "id")
 
-        # Use optimized service for ALL filter parties at once
         # Global balance aggregated over all active businesses
-        bals = get_party_balances(party_qs) 
+        balances = get_cached_party_net_balances()
         
         rows = []
-        for p in bals:
-            balance = p.net_balance or Decimal("0.00")
+        for p in party_qs.only(*_PARTY_ROW_FIELDS):
+            balance = balances.get(p.id) or Decimal("0.00")
             if balance == 0:
                 continue
 
@@ -1806,12 +1808,12 @@ class BusinessesView(ListView):
 
         party_qs = party_qs.order_by("display_name", "id")
 
-        # Use optimized service
-        bals = get_party_balances(party_qs)
+        # Global balances, cached until the next ledger write
+        balances = get_cached_party_net_balances()
         
         rows = []
-        for p in bals:
-            balance = p.net_balance or Decimal("0.00")
+        for p in party_qs.only(*_PARTY_ROW_FIELDS):
+            balance = balances.get(p.id) or Decimal("0.00")
             if balance == 0:
                 continue
 
@@ -2009,7 +2011,7 @@ class PartyBalancesView(View):
             
             opening_bals = {}
             if prev_to:
-                qs_ob = get_party_balances(party_qs, business_id=biz_id_for_service, date_to=prev_to)
+                qs_ob = get_party_balances(party_qs.only("id"), business_id=biz_id_for_service, date_to=prev_to)
                 for p in qs_ob:
                     opening_bals[p.id] = {
                         'net': p.net_balance or Decimal("0.00"),
@@ -2018,7 +2020,16 @@ class PartyBalancesView(View):
                     }
             
             # 2. Closing Balances
-            closing_bals = get_party_balances(party_qs, business_id=biz_id_for_service, date_to=date_to)
+            closing_bals = get_party_balances(
+                party_qs.only(*_PARTY_ROW_FIELDS), business_id=biz_id_for_service, date_to=date_to
+            )
+
+            # 3. Last Payment per party for these businesses, in one grouped query
+            last_paid = dict(
+                Payment.objects.filter(
+                    party_id__in=party_qs.values("id"), business_id__in=biz_ids, is_deleted=False
+                ).order_by().values("party_id").annotate(last=Max("date")).values_list("party_id", "last")
+            )
             
             for p in closing_bals:
                 ob_data = opening_bals.get(p.id, {'net': Decimal("0.00"), 'dr': Decimal("0.00"), 'cr': Decimal("0.00")})
@@ -2034,11 +2045,6 @@ class PartyBalancesView(View):
                 if closing_balance == 0 and delta_dr == 0 and delta_cr == 0 and opening_balance == 0:
                     continue
 
-                # Last Payment specifically for these businesses
-                last_pay = Payment.objects.filter(
-                    party_id=p.id, business_id__in=biz_ids, is_deleted=False
-                ).order_by('-date').first()
-
                 total_opening_bal += opening_balance
                 total_period_dr += delta_dr
                 total_period_cr += delta_cr
@@ -2052,7 +2058,7 @@ class PartyBalancesView(View):
                     "period_credit": delta_cr,
                     "balance_abs": abs(closing_balance),
                     "balance_side": "Dr" if closing_balance >= 0 else "Cr",
-                    "last_paid_date": last_pay.date if last_pay else None,
+                    "last_paid_date": last_paid.get(p.id),
                 })
 
             rows.sort(key=lambda r: r["balance_abs"], reverse=True)
@@ -9,5 +9,5 @@ class Command(BaseCommand):
         businesses = Business.objects.all()
         self.stdout.write(f"Updating summaries for {businesses.count()} businesses...")
         for b in businesses:
-            update_business_summary(b.id)
+            update_business_summary(b.id, force=True)
             self.stdout.write(self.style.SUCCESS(f"Successfully updated {b.name}"))
@@ -9,5 +9,5 @@ class Command(BaseCommand):
         businesses = Business.objects.all()
         for biz in businesses:
             self.stdout.write(f"Updating summary for {biz.name}...")
-            update_business_summary(biz.id)
+            update_business_summary(biz.id, force=True)
         self.stdout.write(self.style.SUCCESS('Successfully updated all business summaries'))
@@ -9,7 +9,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         self.stdout.write("Fetching all parties...")
-        qs = Party.objects.all()
+        qs = Party.objects.only("id")
         
         self.stdout.write("Calculating balances using subqueries...")
         # This executes the unified balance logic for ALL parties in one go (or paged internally by DB)
@@ -23,7 +23,7 @@ class Command(BaseCommand):
         # Using iterator to be memory efficient if large, but we need list for bulk_update.
         # If huge, we should chunk. Assuming < 10,000 parties, list is fine.
         
-        for party in qs:
+        for party in qs.iterator(chunk_size=2000):
             net = party.net_balance or Decimal("0.00")
             party.cached_balance = net
             party.cached_balance_updated_at = now
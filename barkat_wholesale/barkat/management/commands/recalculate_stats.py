@@ -13,7 +13,7 @@ class Command(BaseCommand):
         # 0. Update Business Summaries first
         self.stdout.write("Recalculating BusinessSummaries...")
         for biz in Business.objects.filter(is_deleted=False):
-            update_business_summary(biz.id)
+            update_business_summary(biz.id, force=True)
             self.stdout.write(f" - Updated {biz.name}")
 
         # 1. Unified Global Financials
@@ -23,7 +23,7 @@ class Command(BaseCommand):
 
         # 2. Update Party cached_balance (Maintenance)
         self.stdout.write("Updating party cached balances...")
-        parties = get_party_balances(Party.objects.filter(is_deleted=False))
+        parties = get_party_balances(Party.objects.filter(is_deleted=False).only("id"))
         for p in parties:
             net = p.net_balance or Decimal("0.00")
             Party.objects.filter(pk=p.id).update(
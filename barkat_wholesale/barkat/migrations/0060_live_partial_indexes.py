@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-16 23:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('barkat', '0059_summarystats_total_inventory_valuation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cashflow',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['business', 'date'], name='cashflow_biz_date_live'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['business', 'date'], name='exp_biz_date_live'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['business', 'date'], name='pay_biz_date_live'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseorder',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['business', 'created_at'], name='po_biz_created_live'),
+        ),
+        migrations.AddIndex(
+            model_name='purchasereturn',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['business', 'created_at'], name='pr_biz_created_live'),
+        ),
+        migrations.AddIndex(
+            model_name='salesorder',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['business', 'created_at'], name='so_biz_created_live'),
+        ),
+        migrations.AddIndex(
+            model_name='salesreturn',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['business', 'created_at'], name='sr_biz_created_live'),
+        ),
+    ]
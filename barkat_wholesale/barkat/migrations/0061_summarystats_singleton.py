@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('barkat', '0060_live_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='summarystats',
+            constraint=models.CheckConstraint(condition=models.Q(('pk', 1)), name='summarystats_singleton'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:09
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def backfill_is_cash_payment(apps, schema_editor):
+    Payment = apps.get_model("barkat", "Payment")
+    Payment.objects.filter(
+        Q(payment_method="cash")
+        | Q(
+            payment_method="bank",
+            bank_account__account_type="CASH",
+            bank_account__is_active=True,
+            bank_account__is_deleted=False,
+        )
+    ).update(is_cash_payment=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('barkat', '0061_summarystats_singleton'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='is_cash_payment',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(backfill_is_cash_payment, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('barkat', '0062_payment_is_cash_payment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(condition=models.Q(('purchase_order__isnull', False)), fields=['purchase_order', 'business'], name='expense_po_biz_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(condition=models.Q(('purchase_order__isnull', True)), fields=['business', 'date'], name='expense_operating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['direction', 'business'], name='payment_dir_biz_idx'),
+        ),
+    ]
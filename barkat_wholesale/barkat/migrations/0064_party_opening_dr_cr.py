@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:27
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('barkat', '0063_payment_expense_split_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='party',
+            name='opening_cr',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(opening_balance_side='Cr', then=models.F('opening_balance')), default=models.Value(Decimal('0.00'))), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+        migrations.AddField(
+            model_name='party',
+            name='opening_dr',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(opening_balance_side='Dr', then=models.F('opening_balance')), default=models.Value(Decimal('0.00'))), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+    ]
@@ -9,7 +9,7 @@ from django.core.exceptions import ValidationError
 from datetime import datetime
 from django.db.models import UniqueConstraint
 from decimal import Decimal, ROUND_HALF_UP
-from django.db.models import Sum, F, Case, When, DecimalField, Q
+from django.db.models import Sum, F, Case, When, DecimalField, Q, Value
 
 # --------------------------------
 # Common field presets
@@ -112,6 +112,10 @@ class SummaryStats(models.Model):
 
     class Meta:
         verbose_name_plural = "Summary Stats"
+        constraints = [
+            # Enforced by the database; only the pk=1 row may exist.
+            models.CheckConstraint(condition=Q(pk=1), name="summarystats_singleton"),
+        ]
 
     def __str__(self):
         return f"Global Stats: R={self.total_receivables}, P={self.total_payables}, C={self.cash_in_hand}"
@@ -153,6 +157,25 @@ class Party(TimeStampedBy):
         blank=True,
         help_text='Date when the opening balance was set (defaults to party creation date)'
     )
+
+    # Opening balance split by side, stored by the database so balance
+    # queries can sum a column instead of evaluating a CASE per row
+    opening_dr = models.GeneratedField(
+        expression=Case(
+            When(opening_balance_side='Dr', then=F('opening_balance')),
+            default=Value(Decimal("0.00")),
+        ),
+        output_field=models.DecimalField(**DECIMAL_12_2),
+        db_persist=True,
+    )
+    opening_cr = models.GeneratedField(
+        expression=Case(
+            When(opening_balance_side='Cr', then=F('opening_balance')),
+            default=Value(Decimal("0.00")),
+        ),
+        output_field=models.DecimalField(**DECIMAL_12_2),
+        db_persist=True,
+    )
     
     # Optimization: Signal-updated cached balance
     cached_balance = models.DecimalField(**DECIMAL_12_2, default=0, editable=False)
@@ -651,6 +674,7 @@ class CashFlow(TimeStampedBy):
             models.Index(fields=["date"]),
             models.Index(fields=["flow_type"]),
             models.Index(fields=["bank_account"]),
+            models.Index(fields=["business", "date"], condition=Q(is_deleted=False), name="cashflow_biz_date_live"),
         ]
         ordering = ["-date", "-id"]
 
@@ -1018,8 +1042,8 @@ class BankMovement(TimeStampedBy):
 
         # Update summary if business set
         if self.business_id:
-            from .signals import update_business_summary
-            update_business_summary(self.business_id)
+            from .signals import enqueue_business_summary
+            enqueue_business_summary(self.business_id)
 
 
 # --------------------------------
@@ -1057,6 +1081,19 @@ class StockTransaction(TimeStampedBy):
 # --------------------------------
 # Purchase Orders (+ bridge payments)
 # --------------------------------
+class PurchaseOrderQuerySet(models.QuerySet):
+    def with_full_expenses(self):
+        """Prefetch expenses together with their payment, bank account and cashflows."""
+        return self.prefetch_related(
+            models.Prefetch(
+                "expenses",
+                queryset=Expense.objects.select_related(
+                    "payment__bank_account", "payment__cashflow", "cashflow"
+                ),
+            )
+        )
+
+
 class PurchaseOrder(models.Model):
     STATUS_CHOICES = [
         ("pending", "Pending"),
@@ -1112,8 +1149,13 @@ class PurchaseOrder(models.Model):
     is_active  = models.BooleanField(default=True, db_index=True)
     is_deleted = models.BooleanField(default=False, db_index=True)
 
+    objects = PurchaseOrderQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["business", "created_at"], condition=Q(is_deleted=False), name="po_biz_created_live"),
+        ]
 
     def __str__(self):
         supplier_name = getattr(self.supplier, "display_name", "-")
@@ -1305,6 +1347,9 @@ class PurchaseReturn(models.Model):
 
     class Meta:
         ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["business", "created_at"], condition=Q(is_deleted=False), name="pr_biz_created_live"),
+        ]
 
     def __str__(self):
         return f"PR #{self.pk or '—'} — {getattr(self.supplier, 'display_name', '—')}"
@@ -1577,12 +1622,17 @@ class Payment(TimeStampedBy):
         related_name="linked_payment",
     )
 
+    # Denormalized at save time so the summary signals never load the bank account
+    is_cash_payment = models.BooleanField(default=False, editable=False)
+
     class Meta:
         indexes = [
             models.Index(fields=["business", "date"]),
             models.Index(fields=["party"]),
             models.Index(fields=["direction"]),
             models.Index(fields=["payment_source"]),
+            models.Index(fields=["business", "date"], condition=Q(is_deleted=False), name="pay_biz_date_live"),
+            models.Index(fields=["direction", "business"], name="payment_dir_biz_idx"),
         ]
         ordering = ["-date", "-id"]
 
@@ -1670,10 +1720,24 @@ class Payment(TimeStampedBy):
         How much of this payment is still free to apply to orders/returns.
         """
         return (self.amount or Decimal("0.00")) - self.applied_total
-    
+
+    def _resolve_is_cash(self):
+        """Cash payments, or bank payments into an active CASH-type account."""
+        if self.payment_method == self.PaymentMethod.CASH:
+            return True
+        if self.payment_method != self.PaymentMethod.BANK or not self.bank_account_id:
+            return False
+        acc = self.bank_account
+        return acc.account_type == BankAccount.CASH and acc.is_active and not acc.is_deleted
+
     @transaction.atomic
     def save(self, *args, **kwargs):
         from .models import CashFlow
+
+        self.is_cash_payment = self._resolve_is_cash()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"payment_method", "bank_account", "bank_account_id"} & set(update_fields):
+            kwargs["update_fields"] = [*update_fields, "is_cash_payment"]
         
         # 1. Handle is_deleted: if marked deleted, remove CashFlow and return
         if getattr(self, "is_deleted", False):
@@ -1736,11 +1800,8 @@ class Payment(TimeStampedBy):
             cf.updated_by = self.updated_by
             cf.save(update_fields=["date", "flow_type", "amount", "bank_account", "description", "business", "updated_at", "updated_by"])
             super().save(*args, **kwargs)
-        
-        # Trigger summary update
-        if self.business_id:
-            from .signals import update_business_summary
-            update_business_summary(self.business_id)
+        # Summary recompute is enqueued by on_payment_change, which skips
+        # re-saves that leave every tracked field unchanged.
 
     def delete(self, *args, **kwargs):
         cf = self.cashflow
@@ -1749,8 +1810,8 @@ class Payment(TimeStampedBy):
         if cf:
             cf.delete()
         if biz_id:
-            from .signals import update_business_summary
-            update_business_summary(biz_id)
+            from .signals import enqueue_business_summary
+            enqueue_business_summary(biz_id)
     # ---------- END PART ----------
 
 class PurchaseOrderPayment(TimeStampedBy):
@@ -1868,6 +1929,10 @@ class Expense(TimeStampedBy):
             models.Index(fields=["business", "date"]),
             models.Index(fields=["business", "category"]),
             models.Index(fields=["payment_source"]),
+            models.Index(fields=["business", "date"], condition=Q(is_deleted=False), name="exp_biz_date_live"),
+            # Landed (PO-linked) vs operating expense splits
+            models.Index(fields=["purchase_order", "business"], condition=Q(purchase_order__isnull=False), name="expense_po_biz_idx"),
+            models.Index(fields=["business", "date"], condition=Q(purchase_order__isnull=True), name="expense_operating_idx"),
         ]
         ordering = ["-date", "-id"]
 
@@ -2076,6 +2141,7 @@ class SalesOrder(TimeStampedBy):
         indexes = [
             models.Index(fields=["business", "created_at"]),
             models.Index(fields=["status"]),
+            models.Index(fields=["business", "created_at"], condition=Q(is_deleted=False), name="so_biz_created_live"),
         ]
 
     def __str__(self):
@@ -2426,6 +2492,9 @@ class SalesReturn(TimeStampedBy):
 
     class Meta:
         ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["business", "created_at"], condition=Q(is_deleted=False), name="sr_biz_created_live"),
+        ]
 
     def __str__(self):
         return f"SR #{self.pk or '—'}"
@@ -1,19 +1,15 @@
 from decimal import Decimal
+from functools import lru_cache
+from django.core.cache import cache
 from django.db.models import OuterRef, Subquery, Sum, Q, F, Case, When, Value, DecimalField
 from django.db.models.functions import Coalesce
-from barkat.models import SalesOrder, SalesInvoice, PurchaseReturn, Payment, BankMovement, PurchaseOrder, SalesReturn
+from barkat.models import Party, SalesOrder, SalesInvoice, PurchaseReturn, Payment, BankMovement, PurchaseOrder, SalesReturn
 
-def get_party_balances(qs, business_id=None, exclude_so_ids=None, exclude_po_ids=None, date_to=None):
+
+def _relation_sums(business_id=None, exclude_so_ids=None, exclude_po_ids=None, date_to=None):
     """
-    Annotates the Party queryset with 'net_balance', 'bal_amount', 'bal_side'.
-    Uses Subquery to avoid Cartesian product issues with multiple Sum annotations.
-    
-    Args:
-        qs: Party QuerySet
-        business_id: Optional business ID to filter transactions
-        exclude_so_ids: List/QuerySet of SalesOrder IDs to exclude (for Edit mode)
-        exclude_po_ids: List/QuerySet of PurchaseOrder IDs to exclude (for Edit mode)
-        date_to: Optional date to limit transactions (for historical reports)
+    Per-relation Dr/Cr totals for a party, as correlated Subquery expressions
+    keyed by annotation name.
     """
 
     # Helper for subqueries
@@ -110,44 +106,66 @@ def get_party_balances(qs, business_id=None, exclude_so_ids=None, exclude_po_ids
         extra_filter=Q(direction="in") & ~Q(cheque_status="pending")
     )
 
-    qs = qs.annotate(
+    return {
         # --- DR ---
-        dr_so=dr_so,
-        dr_inv=dr_inv,
-        dr_pr=dr_pr,
-        dr_pay=dr_pay,
-        dr_bm_raw=dr_bm_val,
-        
+        "dr_so": dr_so,
+        "dr_inv": dr_inv,
+        "dr_pr": dr_pr,
+        "dr_pay": dr_pay,
+        "dr_bm_raw": dr_bm_val,
+
         # --- CR ---
-        cr_po=cr_po,
-        cr_sr=cr_sr,
-        cr_pay=cr_pay,
-    )
+        "cr_po": cr_po,
+        "cr_sr": cr_sr,
+        "cr_pay": cr_pay,
+    }
+
+
+@lru_cache(maxsize=64)
+def _shared_relation_sums(business_id, date_to):
+    """
+    _relation_sums() built once per (business, date) and reused. The
+    expressions correlate through OuterRef("pk"), so each query resolves them
+    against its own Party alias (annotate() works on copies, leaving these
+    untouched).
+    """
+    return _relation_sums(business_id=business_id, date_to=date_to)
+
+
+def get_party_balances(qs, business_id=None, exclude_so_ids=None, exclude_po_ids=None, date_to=None):
+    """
+    Annotates the Party queryset with 'net_balance', 'bal_amount', 'bal_side'.
+    Uses Subquery to avoid Cartesian product issues with multiple Sum annotations.
+    
+    Args:
+        qs: Party QuerySet
+        business_id: Optional business ID to filter transactions
+        exclude_so_ids: List/QuerySet of SalesOrder IDs to exclude (for Edit mode)
+        exclude_po_ids: List/QuerySet of PurchaseOrder IDs to exclude (for Edit mode)
+        date_to: Optional date to limit transactions (for historical reports)
+    """
+    if exclude_so_ids or exclude_po_ids:
+        sums = _relation_sums(business_id, exclude_so_ids, exclude_po_ids, date_to)
+    else:
+        sums = _shared_relation_sums(business_id or None, date_to)
+    qs = qs.annotate(**sums)
 
     qs = qs.annotate(dr_bm=Coalesce(F("dr_bm_raw"), Value(0, output_field=DecimalField())))
+
+    # Opening balance: Party.opening_dr / opening_cr are stored generated
+    # columns, so only the business scoping still needs a CASE.
+    def _opening(field):
+        if not business_id:
+            return F(field)
+        return Case(
+            When(default_business_id=business_id, then=F(field)),
+            default=Decimal(0),
+            output_field=DecimalField()
+        )
     
     qs = qs.annotate(
-        final_dr=F("dr_so") + F("dr_inv") + F("dr_pr") + F("dr_pay") + F("dr_bm") +
-                 Case(
-                     When(
-                         Q(opening_balance_side='Dr') & 
-                         (Q(default_business_id=business_id) if business_id else Q(id__isnull=False)), 
-                         then=F('opening_balance')
-                     ), 
-                     default=Decimal(0), 
-                     output_field=DecimalField()
-                 ),
-        
-        final_cr=F("cr_po") + F("cr_sr") + F("cr_pay") + 
-                 Case(
-                     When(
-                         Q(opening_balance_side='Cr') & 
-                         (Q(default_business_id=business_id) if business_id else Q(id__isnull=False)), 
-                         then=F('opening_balance')
-                     ), 
-                     default=Decimal(0), 
-                     output_field=DecimalField()
-                 ),
+        final_dr=F("dr_so") + F("dr_inv") + F("dr_pr") + F("dr_pay") + F("dr_bm") + _opening("opening_dr"),
+        final_cr=F("cr_po") + F("cr_sr") + F("cr_pay") + _opening("opening_cr"),
     )
     
     qs = qs.annotate(
@@ -155,3 +173,32 @@ def get_party_balances(qs, business_id=None, exclude_so_ids=None, exclude_po_ids
     )
     
     return qs
+
+
+# Bumped (on commit) by barkat.signals for every write that can move a party
+# balance. It is part of the cache key, so a stale snapshot is never read.
+# The shared cache backend (settings.CACHES) carries bumps made by management
+# commands and other workers to the server process.
+_LEDGER_VERSION_KEY = "barkat:ledger_version"
+
+
+def bump_ledger_version():
+    try:
+        cache.incr(_LEDGER_VERSION_KEY)
+    except ValueError:
+        cache.set(_LEDGER_VERSION_KEY, 1, None)
+
+
+def get_cached_party_net_balances():
+    """
+    {party_id: net_balance} for every party across all businesses, cached
+    until the next ledger write. For screens that only need the global
+    balance of each party (no business, date or exclusion filters).
+    """
+    version = cache.get_or_set(_LEDGER_VERSION_KEY, 1, None)
+    key = f"barkat:party_net_balances:{version}"
+    balances = cache.get(key)
+    if balances is None:
+        balances = dict(get_party_balances(Party.objects.all()).values_list("id", "net_balance"))
+        cache.set(key, balances, 60 * 60)
+    return balances
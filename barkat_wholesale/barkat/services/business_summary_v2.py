@@ -5,7 +5,10 @@ Calculates opening balance, sales, purchases, expenses, receipts, payments, and
 """
 from decimal import Decimal
 from datetime import date
-from django.db.models import Sum, Q, F, Case, When, DecimalField
+from functools import wraps
+from django.core.cache import cache
+from django.db.models import Sum, Q, F, Case, When, DecimalField, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from typing import Dict, Any, Optional
 
@@ -16,6 +19,55 @@ from barkat.models import (
 )
 
 
+# ========================================
+# SECTION CACHE
+# ========================================
+
+# Bumped (on commit) by barkat.signals whenever a record feeding these
+# reports is saved or deleted, and by suspend_financial_signals after a bulk
+# load. The counter lives in the shared cache backend (settings.CACHES), so
+# bumps made by management commands and other workers reach the server too.
+# It is part of every section key, so stale sections are never hit.
+_DATA_VERSION_KEY = "barkat:report_data_version"
+
+# Sections also expire on their own, in case a write bypasses the receivers
+# (QuerySet.update() outside suspend_financial_signals)
+_SECTION_TTL = 10 * 60
+
+
+def bump_data_version() -> None:
+    try:
+        cache.incr(_DATA_VERSION_KEY)
+    except ValueError:
+        cache.set(_DATA_VERSION_KEY, 1, None)
+
+
+def _data_version() -> int:
+    return cache.get_or_set(_DATA_VERSION_KEY, 1, None)
+
+
+def _cached_section(method):
+    """
+    Cache a report section per (business, start_date, end_date, data version).
+    Sections are pure functions of those inputs, so repeated report passes
+    (closing balance, print view, JSON export) reuse the computed dicts.
+    """
+    @wraps(method)
+    def wrapper(self):
+        key = (
+            f"barkat:report:{method.__name__}:{self.business.pk}:"
+            f"{self.start_date}:{self.end_date}:{_data_version()}"
+        )
+        # Each get() unpickles a fresh dict, so callers can't mutate the cached one
+        section = cache.get(key)
+        if section is None:
+            section = method(self)
+            cache.set(key, section, _SECTION_TTL)
+        return section
+
+    return wrapper
+
+
 class BusinessSummaryReportV2:
     """
     Generate comprehensive business summary for a given date range
@@ -25,7 +77,6 @@ class BusinessSummaryReportV2:
         self.business = business
         self.start_date = start_date
         self.end_date = end_date
-        self._cache = {}
     
     def generate_full_report(self) -> Dict[str, Any]:
         """
@@ -53,6 +104,7 @@ class BusinessSummaryReportV2:
     # OPENING BALANCE
     # ========================================
     
+    @_cached_section
     def get_opening_balance(self) -> Dict[str, Decimal]:
         """
         Calculate opening balance (before start_date)
@@ -83,6 +135,7 @@ class BusinessSummaryReportV2:
     # SALES SUMMARY
     # ========================================
     
+    @_cached_section
     def get_sales_summary(self) -> Dict[str, Any]:
         """
         Complete sales summary with payment breakdown
@@ -103,9 +156,13 @@ class BusinessSummaryReportV2:
             is_deleted=False
         )
         
-        # Total sales amount
-        so_total = sales_orders.aggregate(total=Sum('net_total'))['total'] or Decimal('0.00')
-        si_total = sales_invoices.aggregate(total=Sum('net_total'))['total'] or Decimal('0.00')
+        # Total sales amount (both tables summed in a single round-trip)
+        totals = Business.objects.filter(pk=self.business.pk).values(
+            so_total=self._sum_subquery(sales_orders, 'net_total'),
+            si_total=self._sum_subquery(sales_invoices, 'net_total'),
+        ).get()
+        so_total = totals['so_total']
+        si_total = totals['si_total']
         total_sales = so_total + si_total
         
         # Sales Returns (Credit Note)
@@ -146,6 +203,7 @@ class BusinessSummaryReportV2:
             'receipt_percentage': (total_received / (total_sales - total_returns) * 100) if (total_sales - total_returns) > 0 else Decimal('0.00'),
         }
     
+    @_cached_section
     def _get_sales_receipts_breakdown(self) -> Dict[str, Any]:
         """
         Breakdown of how sales receipts were received
@@ -197,6 +255,7 @@ class BusinessSummaryReportV2:
     # PURCHASES SUMMARY
     # ========================================
     
+    @_cached_section
     def get_purchases_summary(self) -> Dict[str, Any]:
         """
         Complete purchases summary with payment breakdown
@@ -271,6 +330,7 @@ class BusinessSummaryReportV2:
             'payment_percentage': (total_paid / (total_purchases - total_returns) * 100) if (total_purchases - total_returns) > 0 else Decimal('0.00'),
         }
     
+    @_cached_section
     def _get_purchase_payments_breakdown(self) -> Dict[str, Any]:
         """
         Breakdown of how purchase payments were made
@@ -322,6 +382,7 @@ class BusinessSummaryReportV2:
     # EXPENSES SUMMARY
     # ========================================
     
+    @_cached_section
     def get_expenses_summary(self) -> Dict[str, Any]:
         """
         Complete expenses summary by category and payment method
@@ -390,6 +451,7 @@ class BusinessSummaryReportV2:
     # DEPOSITS SUMMARY
     # ========================================
     
+    @_cached_section
     def get_deposits_summary(self) -> Dict[str, Any]:
         """
         Summary of deposits made to bank (cash -> bank, cheque -> bank)
@@ -433,6 +495,7 @@ class BusinessSummaryReportV2:
     # CURRENT POSITION
     # ========================================
     
+    @_cached_section
     def get_current_position(self) -> Dict[str, Any]:
         """
         Current cash and bank positions (as of end_date)
@@ -521,6 +584,22 @@ class BusinessSummaryReportV2:
     # HELPER METHODS
     # ========================================
     
+    def _sum_subquery(self, qs, field: str) -> Coalesce:
+        """
+        Wrap SUM(field) over a business-scoped queryset as a scalar subquery,
+        so several totals can be fetched with one SELECT
+        """
+        return Coalesce(
+            Subquery(
+                qs.order_by()
+                .values('business')
+                .annotate(total=Sum(field))
+                .values('total')
+            ),
+            Decimal('0.00'),
+            output_field=DecimalField(max_digits=12, decimal_places=2)
+        )
+    
     def _calculate_cash_balance(self, before_date: date, inclusive: bool = False) -> Decimal:
         """
         Calculate total cash balance (CashFlow with bank_account=NULL)
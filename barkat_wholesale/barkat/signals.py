@@ -1,6 +1,7 @@
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
-from django.db.models import Sum, F, Q, Case, When, DecimalField
+from django.db.models import Sum, F, Q, Case, When, Value, DecimalField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from decimal import Decimal
 from .models import (
     Business, BusinessSummary, SummaryStats,
@@ -9,117 +10,322 @@ from .models import (
     Payment, Expense, Product,
     StockMove, SalesReturn, SalesReturnRefund,
     PurchaseReturn, PurchaseReturnRefund,
-    Party, BankMovement, SalesInvoice, BankAccount
+    Party, BankMovement, SalesInvoice, BankAccount, CashFlow
 )
 from django.utils import timezone
-from barkat.services.balance_service import get_party_balances
+from barkat.services.balance_service import get_party_balances, bump_ledger_version
+from barkat.services import business_summary_v2
 from django.db import transaction
+import threading
+import weakref
+from functools import lru_cache
+
+_ZERO = Decimal("0.00")
+
+def _as_decimal(value):
+    # DecimalFields already hold Decimals; only convert the odd int/float/str
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        return Decimal(str(value))
+    return Decimal(value or 0)
 
 def _get_summary_stats():
     return SummaryStats.get_stats()
 
+# ---------------------------------------------------------
+# Deferred Recomputation (coalesced per transaction)
+# ---------------------------------------------------------
+# Receivers only mark businesses/parties as dirty; the heavy recomputes run
+# once per distinct id when the surrounding transaction commits. Outside an
+# atomic block on_commit fires immediately, so behaviour there is unchanged.
+# By then the write itself has committed, so a failing recompute is logged
+# (robust=True) instead of turning a saved record into an error response.
+
+_pending = threading.local()
+
+def _pending_set(name):
+    dirty = getattr(_pending, name, None)
+    if dirty is None:
+        dirty = set()
+        setattr(_pending, name, dirty)
+    return dirty
+
+def _schedule_flush():
+    # Registered on every enqueue: a rolled-back savepoint discards its own
+    # callbacks, and later flushes find the sets already drained (no-op).
+    transaction.on_commit(_flush_pending, robust=True)
+
+def enqueue_business_summary(business_id):
+    if not business_id:
+        return
+    _pending_set('dirty_businesses').add(business_id)
+    _schedule_flush()
+
+def enqueue_party_balance(party_id):
+    if not party_id:
+        return
+    _pending_set('dirty_parties').add(party_id)
+    _schedule_flush()
+
+def enqueue_po_business_summary(instance):
+    """Enqueue the business of the PurchaseOrder an instance is linked to."""
+    if not instance.purchase_order_id:
+        return
+    if type(instance).purchase_order.is_cached(instance):
+        enqueue_business_summary(instance.purchase_order.business_id)
+        return
+    # Resolved for all dirty POs with one query at flush time
+    _pending_set('dirty_purchase_orders').add(instance.purchase_order_id)
+    _schedule_flush()
+
+def _flush_pending():
+    businesses = _pending_set('dirty_businesses')
+    parties = _pending_set('dirty_parties')
+    purchase_orders = _pending_set('dirty_purchase_orders')
+    if not businesses and not parties and not purchase_orders:
+        return
+    _pending.dirty_businesses = set()
+    _pending.dirty_parties = set()
+    _pending.dirty_purchase_orders = set()
+
+    if purchase_orders:
+        businesses.update(
+            PurchaseOrder.objects.filter(pk__in=purchase_orders).values_list('business_id', flat=True)
+        )
+
+    for business_id in businesses:
+        update_business_summary(business_id)
+    if parties:
+        update_party_balances(parties, now=timezone.now())
+
 # ---------------------------------------------------------
 # SummaryStats Atomic Updates (Real-Time Global Statistics)
 # ---------------------------------------------------------
+# Receivers accumulate F() increments per savepoint and the SummaryStats row
+# is updated (and locked) once per savepoint, on commit.
 
-def capture_orig(instance, fields):
-    if instance.pk:
-        try:
-            orig = instance.__class__.objects.only(*fields).get(pk=instance.pk)
-            for f in fields:
-                setattr(instance, f'_orig_{f}', getattr(orig, f))
-        except instance.__class__.DoesNotExist:
-            for f in fields:
-                setattr(instance, f'_orig_{f}', None)
-    else:
+class _SummaryDelta(dict):
+    """
+    Pending {field: diff} increments for the SummaryStats row, collected
+    inside one savepoint. The batch is itself the on_commit callback: if the
+    savepoint rolls back, Django drops the callback and its increments with
+    it, and the weak entry in _delta_batches() dies.
+    """
+    def __init__(self, sid):
+        super().__init__()
+        self.sid = sid
+
+    def __call__(self):
+        batches = _delta_batches()
+        if batches.get(self.sid) is self:
+            del batches[self.sid]
+        updates = {field: F(field) + diff for field, diff in self.items() if diff}
+        self.clear()
+        if updates:
+            _SUMMARY_ROW.update(**updates)
+
+_summary_delta = threading.local()
+
+def _delta_batches():
+    """This thread's open batches, keyed by savepoint id (None: no savepoint)."""
+    batches = getattr(_summary_delta, 'batches', None)
+    if batches is None:
+        batches = _summary_delta.batches = weakref.WeakValueDictionary()
+    return batches
+
+# Prebuilt queryset for the singleton row. It is only ever used for update(),
+# which works on a clone, so its result cache is never populated.
+_SUMMARY_ROW = SummaryStats._default_manager.filter(pk=1)
+
+def _add_summary_delta(field, diff):
+    if not diff:
+        return
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _SUMMARY_ROW.update(**{field: F(field) + diff})
+        return
+    # Innermost real savepoint; atomic(savepoint=False) levels push None and
+    # roll back with their enclosing savepoint
+    sid = next((s for s in reversed(connection.savepoint_ids) if s), None)
+    batches = _delta_batches()
+    batch = batches.get(sid)
+    if batch is None:
+        batch = batches[sid] = _SummaryDelta(sid)
+        transaction.on_commit(batch)
+    batch[field] = batch.get(field, 0) + diff
+
+# Slotted stand-ins for an instance's pre-save state (see capture_orig)
+class _OldPay:
+    __slots__ = ('amount', 'direction', 'is_cash_payment', 'is_deleted')
+
+class _OldExp:
+    __slots__ = ('amount', 'payment_source', 'is_deleted')
+
+class _OldParty:
+    __slots__ = ('opening_balance', 'opening_balance_side', 'is_deleted')
+
+class _OldBank:
+    __slots__ = ('opening_balance', 'account_type', 'is_active')
+
+class _OldProd:
+    __slots__ = ('stock_qty', 'purchase_price', 'is_active', 'is_deleted')
+
+class _OldBM:
+    __slots__ = ('amount', 'movement_type')
+
+# Fields each pre_save snapshots; shared tuples so the hot path allocates
+# nothing and _field_names can memoize on them.
+_SO_FIELDS = ('net_total', 'status', 'business_id', 'customer_id', 'is_deleted', 'is_active')
+_INV_FIELDS = _SO_FIELDS
+_PO_FIELDS = ('net_total', 'status', 'business_id', 'supplier_id', 'is_deleted', 'is_active')
+# cashflow: Payment.save's soft-delete and un-mirror paths save only
+# update_fields=["cashflow", ...] and still need the full reversal
+_PAY_FIELDS = (
+    'amount', 'direction', 'is_cash_payment', 'payment_method', 'bank_account_id',
+    'cheque_status', 'party_id', 'is_deleted', 'is_active', 'business_id',
+    'cashflow_id',
+)
+_EXP_FIELDS = ('amount', 'payment_source', 'is_deleted', 'business_id')
+_PARTY_FIELDS = ('opening_balance', 'opening_balance_side', 'is_deleted')
+_BANK_FIELDS = ('opening_balance', 'account_type', 'is_active')
+_RETURN_FIELDS = ('net_total', 'status')
+_PROD_FIELDS = ('stock_qty', 'purchase_price', 'is_active', 'is_deleted')
+_BM_FIELDS = ('amount', 'movement_type', 'business_id')
+
+@lru_cache(maxsize=None)
+def _field_names(fields):
+    # update_fields may name a FK either as 'business' or 'business_id'.
+    # Called with the tuples above or Django's update_fields frozenset.
+    return frozenset(f[:-3] if f.endswith('_id') else f for f in fields)
+
+def _untouched(update_fields, fields):
+    """True when a save(update_fields=...) could not have changed any of `fields`."""
+    return update_fields is not None and _field_names(fields).isdisjoint(_field_names(update_fields))
+
+_MISSING = object()
+
+def _noop_save(instance, fields, kwargs):
+    """True for an update save that left every snapshotted field as it was."""
+    if kwargs.get('signal') is not post_save or kwargs.get('created'):
+        return False
+    return all(getattr(instance, f'_orig_{f}', _MISSING) == getattr(instance, f) for f in fields)
+
+def capture_orig(instance, fields, update_fields=None):
+    """
+    Stash the stored values of `fields` on the instance as `_orig_<field>`.
+    When save(update_fields=...) can't touch any tracked field, the current
+    values are the stored ones, so no SELECT is issued.
+    """
+    if instance.pk and _untouched(update_fields, fields):
         for f in fields:
-            setattr(instance, f'_orig_{f}', None)
+            setattr(instance, f'_orig_{f}', getattr(instance, f))
+        return
 
-@receiver(post_save, sender=SummaryStats)
-def ensure_singleton(sender, instance, **kwargs):
-    if instance.pk != 1:
-        instance.delete()
-        raise ValueError("SummaryStats is a singleton and must have pk=1")
+    orig = None
+    if instance.pk:
+        orig = instance.__class__.objects.filter(pk=instance.pk).values_list(*fields).first()
+    if orig is None:
+        orig = (None,) * len(fields)
+    for f, value in zip(fields, orig):
+        setattr(instance, f'_orig_{f}', value)
 
 # 1. SalesOrder Signals (Receivables)
-@receiver(pre_save, sender=SalesOrder)
+@receiver(pre_save, sender=SalesOrder, dispatch_uid='barkat.so_pre_save')
 def so_pre_save(sender, instance, **kwargs):
-    capture_orig(instance, ['net_total', 'status', 'business_id'])
+    capture_orig(instance, _SO_FIELDS, kwargs.get('update_fields'))
 
-@receiver(post_save, sender=SalesOrder)
+@receiver(post_save, sender=SalesOrder, dispatch_uid='barkat.so_post_save')
 def so_post_save(sender, instance, created, **kwargs):
-    old_total = getattr(instance, '_orig_net_total', Decimal("0.00")) or Decimal("0.00")
+    if _untouched(kwargs.get('update_fields'), _SO_FIELDS):
+        return
+    if not created and _noop_save(instance, _SO_FIELDS, kwargs):
+        return
+    old_total = getattr(instance, '_orig_net_total', _ZERO) or _ZERO
     old_status = getattr(instance, '_orig_status', None)
     
-    new_total = instance.net_total or Decimal("0.00")
+    new_total = instance.net_total or _ZERO
     new_status = instance.status
 
     # Only count if not cancelled
-    val_old = old_total if old_status != 'CANCELLED' else Decimal("0.00")
-    val_new = new_total if new_status != 'CANCELLED' else Decimal("0.00")
+    val_old = old_total if old_status != 'CANCELLED' else _ZERO
+    val_new = new_total if new_status != 'CANCELLED' else _ZERO
     
     diff = val_new - val_old
     if diff != 0:
-        SummaryStats.objects.filter(pk=1).update(total_receivables=F('total_receivables') + diff)
+        _add_summary_delta('total_receivables', diff)
 
     # Business summary update
     old_biz_id = getattr(instance, '_orig_business_id', None)
     new_biz_id = instance.business_id
     if old_biz_id and old_biz_id != new_biz_id:
-        update_business_summary(old_biz_id)
-    update_business_summary(new_biz_id)
+        enqueue_business_summary(old_biz_id)
+    enqueue_business_summary(new_biz_id)
 
-@receiver(post_delete, sender=SalesOrder)
+@receiver(post_delete, sender=SalesOrder, dispatch_uid='barkat.so_post_delete')
 def so_post_delete(sender, instance, **kwargs):
+    if not instance.net_total:
+        return
     if instance.status != 'CANCELLED':
-        SummaryStats.objects.filter(pk=1).update(total_receivables=F('total_receivables') - (instance.net_total or 0))
-    update_business_summary(instance.business_id)
+        _add_summary_delta('total_receivables', -(instance.net_total or 0))
+    enqueue_business_summary(instance.business_id)
 
 # 2. PurchaseOrder Signals (Payables)
-@receiver(pre_save, sender=PurchaseOrder)
+@receiver(pre_save, sender=PurchaseOrder, dispatch_uid='barkat.po_pre_save')
 def po_pre_save(sender, instance, **kwargs):
-    capture_orig(instance, ['net_total', 'status', 'business_id'])
+    capture_orig(instance, _PO_FIELDS, kwargs.get('update_fields'))
 
-@receiver(post_save, sender=PurchaseOrder)
+@receiver(post_save, sender=PurchaseOrder, dispatch_uid='barkat.po_post_save')
 def po_post_save(sender, instance, created, **kwargs):
-    old_total = getattr(instance, '_orig_net_total', Decimal("0.00")) or Decimal("0.00")
+    if _untouched(kwargs.get('update_fields'), _PO_FIELDS):
+        return
+    if not created and _noop_save(instance, _PO_FIELDS, kwargs):
+        return
+    old_total = getattr(instance, '_orig_net_total', _ZERO) or _ZERO
     old_status = getattr(instance, '_orig_status', None)
     
-    new_total = instance.net_total or Decimal("0.00")
+    new_total = instance.net_total or _ZERO
     new_status = instance.status
 
-    val_old = old_total if old_status != 'CANCELLED' else Decimal("0.00")
-    val_new = new_total if new_status != 'CANCELLED' else Decimal("0.00")
+    val_old = old_total if old_status != 'CANCELLED' else _ZERO
+    val_new = new_total if new_status != 'CANCELLED' else _ZERO
     
     diff = val_new - val_old
     if diff != 0:
-        SummaryStats.objects.filter(pk=1).update(total_payables=F('total_payables') + diff)
+        _add_summary_delta('total_payables', diff)
 
     # Business summary update
     old_biz_id = getattr(instance, '_orig_business_id', None)
     new_biz_id = instance.business_id
     if old_biz_id and old_biz_id != new_biz_id:
-        update_business_summary(old_biz_id)
-    update_business_summary(new_biz_id)
+        enqueue_business_summary(old_biz_id)
+    enqueue_business_summary(new_biz_id)
 
-@receiver(post_delete, sender=PurchaseOrder)
+@receiver(post_delete, sender=PurchaseOrder, dispatch_uid='barkat.po_post_delete')
 def po_post_delete(sender, instance, **kwargs):
+    if not instance.net_total:
+        return
     if instance.status != 'CANCELLED':
-        SummaryStats.objects.filter(pk=1).update(total_payables=F('total_payables') - (instance.net_total or 0))
-    update_business_summary(instance.business_id)
+        _add_summary_delta('total_payables', -(instance.net_total or 0))
+    enqueue_business_summary(instance.business_id)
 
 # 3. Payment Signals (Receivables/Payables reduction + Cash In Hand)
-@receiver(pre_save, sender=Payment)
+@receiver(pre_save, sender=Payment, dispatch_uid='barkat.pay_pre_save')
 def pay_pre_save(sender, instance, **kwargs):
-    capture_orig(instance, ['amount', 'direction', 'payment_method', 'bank_account', 'is_deleted', 'business_id'])
+    capture_orig(instance, _PAY_FIELDS, kwargs.get('update_fields'))
 
-@receiver(post_save, sender=Payment)
+@receiver(post_save, sender=Payment, dispatch_uid='barkat.pay_post_save')
 def pay_post_save(sender, instance, created, **kwargs):
+    if _untouched(kwargs.get('update_fields'), _PAY_FIELDS):
+        return
+    if not created and _noop_save(instance, _PAY_FIELDS, kwargs):
+        return
     def get_impact(obj):
         if not obj or getattr(obj, 'is_deleted', False): return (0, 0, 0)
         
-        amt = obj.amount or Decimal("0.00")
+        amt = obj.amount or _ZERO
         dr = obj.direction # 'in' or 'out'
+        if not amt or dr not in ('in', 'out'): return (0, 0, 0)
         
         # Receivables/Payables impact
         # IN = money from customer/supplier. OUT = money to customer/supplier.
@@ -128,91 +334,80 @@ def pay_post_save(sender, instance, created, **kwargs):
         rec_impact = -amt if dr == 'in' else 0
         pay_impact = -amt if dr == 'out' else 0
         
-        # Cash impact logic
-        is_cash = False
-        if obj.payment_method == 'cash':
-            is_cash = True
-        elif obj.payment_method == 'bank' and obj.bank_account and obj.bank_account.account_type == 'CASH':
-            # Assuming BankAccount also has is_active/is_deleted if we're following the pattern
-            if getattr(obj.bank_account, 'is_active', True) and not getattr(obj.bank_account, 'is_deleted', False):
-                is_cash = True
-        
+        # Cash impact: resolved once in Payment.save (see _resolve_is_cash)
         cash_impact = 0
-        if is_cash:
+        if obj.is_cash_payment:
             cash_impact = amt if dr == 'in' else -amt
             
         return (rec_impact, pay_impact, cash_impact)
 
     # We treat the old state as a "mock" object for impacts
-    class MockPay:
-        pass
-    
-    old_obj = MockPay()
+    old_obj = _OldPay()
     old_obj.amount = getattr(instance, '_orig_amount', 0)
     old_obj.direction = getattr(instance, '_orig_direction', None)
-    old_obj.payment_method = getattr(instance, '_orig_payment_method', None)
-    old_obj.bank_account = getattr(instance, '_orig_bank_account', None)
+    old_obj.is_cash_payment = getattr(instance, '_orig_is_cash_payment', False)
     old_obj.is_deleted = getattr(instance, '_orig_is_deleted', False)
-    
-    old_rec, old_pay, old_cash = get_impact(old_obj)
-    new_rec, new_pay, new_cash = get_impact(instance)
-    
-    diff_rec = new_rec - old_rec
-    diff_pay = new_pay - old_pay
-    diff_cash = new_cash - old_cash
-    
-    if diff_rec != 0 or diff_pay != 0 or diff_cash != 0:
-        SummaryStats.objects.filter(pk=1).update(
-            total_receivables=F('total_receivables') + diff_rec,
-            total_payables=F('total_payables') + diff_pay,
-            cash_in_hand=F('cash_in_hand') + diff_cash
-        )
+
+    # Re-save with identical inputs: skip the impact arithmetic entirely
+    old_state = (old_obj.amount, old_obj.direction, old_obj.is_cash_payment, old_obj.is_deleted)
+    new_state = (instance.amount, instance.direction, instance.is_cash_payment, instance.is_deleted)
+    if old_state != new_state:
+        old_rec, old_pay, old_cash = get_impact(old_obj)
+        new_rec, new_pay, new_cash = get_impact(instance)
+
+        diff_rec = new_rec - old_rec
+        diff_pay = new_pay - old_pay
+        diff_cash = new_cash - old_cash
+
+        if diff_rec != 0 or diff_pay != 0 or diff_cash != 0:
+            _add_summary_delta('total_receivables', diff_rec)
+            _add_summary_delta('total_payables', diff_pay)
+            _add_summary_delta('cash_in_hand', diff_cash)
 
     # Business summary update
     old_biz_id = getattr(instance, '_orig_business_id', None)
     new_biz_id = instance.business_id
     if old_biz_id and old_biz_id != new_biz_id:
-        update_business_summary(old_biz_id)
-    update_business_summary(new_biz_id)
+        enqueue_business_summary(old_biz_id)
+    enqueue_business_summary(new_biz_id)
 
-@receiver(post_delete, sender=Payment)
+@receiver(post_delete, sender=Payment, dispatch_uid='barkat.pay_post_delete')
 def pay_post_delete(sender, instance, **kwargs):
     # Reverse the impact
     # Reuse impact logic
     def get_impact(obj):
         if getattr(obj, 'is_deleted', False): return (0, 0, 0)
-        amt = obj.amount or Decimal("0.00")
+        amt = obj.amount or _ZERO
         dr = obj.direction
         rec = -amt if dr == 'in' else 0
         pay = -amt if dr == 'out' else 0
-        is_cash = (obj.payment_method == 'cash' or 
-                  (obj.payment_method == 'bank' and obj.bank_account and obj.bank_account.account_type == 'CASH'))
-        cash = (amt if dr == 'in' else -amt) if is_cash else 0
+        cash = (amt if dr == 'in' else -amt) if obj.is_cash_payment else 0
         return (rec, pay, cash)
     
     r, p, c = get_impact(instance)
-    SummaryStats.objects.filter(pk=1).update(
-        total_receivables=F('total_receivables') - r,
-        total_payables=F('total_payables') - p,
-        cash_in_hand=F('cash_in_hand') - c
-    )
-    update_business_summary(instance.business_id)
+    _add_summary_delta('total_receivables', -r)
+    _add_summary_delta('total_payables', -p)
+    _add_summary_delta('cash_in_hand', -c)
+    enqueue_business_summary(instance.business_id)
 
 # 4. Expense Signals (Cash In Hand)
-@receiver(pre_save, sender=Expense)
+@receiver(pre_save, sender=Expense, dispatch_uid='barkat.exp_pre_save')
 def exp_pre_save(sender, instance, **kwargs):
-    capture_orig(instance, ['amount', 'payment_source', 'is_deleted', 'business_id'])
+    capture_orig(instance, _EXP_FIELDS, kwargs.get('update_fields'))
 
-@receiver(post_save, sender=Expense)
+@receiver(post_save, sender=Expense, dispatch_uid='barkat.exp_post_save')
 def exp_post_save(sender, instance, created, **kwargs):
+    if _untouched(kwargs.get('update_fields'), _EXP_FIELDS):
+        return
+    if not created and _noop_save(instance, _EXP_FIELDS, kwargs):
+        return
     def get_cash_impact(obj):
         if not obj or getattr(obj, 'is_deleted', False): return 0
-        amt = obj.amount or Decimal("0.00")
+        amt = obj.amount or _ZERO
         # Expense is always OUT
         return -amt if obj.payment_source == 'cash' else 0
 
-    class MockExp: pass
-    old_obj = MockExp()
+    old_obj = _OldExp()
     old_obj.amount = getattr(instance, '_orig_amount', 0)
     old_obj.payment_source = getattr(instance, '_orig_payment_source', None)
     old_obj.is_deleted = getattr(instance, '_orig_is_deleted', False)
@@ -222,38 +417,39 @@ def exp_post_save(sender, instance, created, **kwargs):
     
     diff = new_c - old_c
     if diff != 0:
-        SummaryStats.objects.filter(pk=1).update(cash_in_hand=F('cash_in_hand') + diff)
+        _add_summary_delta('cash_in_hand', diff)
 
     # Business summary update
     old_biz_id = getattr(instance, '_orig_business_id', None)
     new_biz_id = instance.business_id
     if old_biz_id and old_biz_id != new_biz_id:
-        update_business_summary(old_biz_id)
-    update_business_summary(new_biz_id)
+        enqueue_business_summary(old_biz_id)
+    enqueue_business_summary(new_biz_id)
 
-@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=Expense, dispatch_uid='barkat.exp_post_delete')
 def exp_post_delete(sender, instance, **kwargs):
     if not instance.is_deleted and instance.payment_source == 'cash':
-        SummaryStats.objects.filter(pk=1).update(cash_in_hand=F('cash_in_hand') + (instance.amount or 0))
-    update_business_summary(instance.business_id)
+        _add_summary_delta('cash_in_hand', instance.amount or 0)
+    enqueue_business_summary(instance.business_id)
 
 # 5. Party Signals (Opening Balance -> Receivables/Payables)
-@receiver(pre_save, sender=Party)
+@receiver(pre_save, sender=Party, dispatch_uid='barkat.party_pre_save')
 def party_pre_save(sender, instance, **kwargs):
-    capture_orig(instance, ['opening_balance', 'opening_balance_side', 'is_deleted'])
+    capture_orig(instance, _PARTY_FIELDS, kwargs.get('update_fields'))
 
-@receiver(post_save, sender=Party)
+@receiver(post_save, sender=Party, dispatch_uid='barkat.party_post_save')
 def party_post_save(sender, instance, created, **kwargs):
+    if _untouched(kwargs.get('update_fields'), _PARTY_FIELDS):
+        return
     def get_impact(obj):
         if not obj or getattr(obj, 'is_deleted', False): return (0, 0)
-        bal = obj.opening_balance or Decimal("0.00")
+        bal = obj.opening_balance or _ZERO
         side = obj.opening_balance_side # 'Dr' or 'Cr'
         rec = bal if side == 'Dr' else 0
         pay = bal if side == 'Cr' else 0
         return (rec, pay)
 
-    class MockParty: pass
-    old_obj = MockParty()
+    old_obj = _OldParty()
     old_obj.opening_balance = getattr(instance, '_orig_opening_balance', 0)
     old_obj.opening_balance_side = getattr(instance, '_orig_opening_balance_side', 'Dr')
     old_obj.is_deleted = getattr(instance, '_orig_is_deleted', False)
@@ -265,33 +461,32 @@ def party_post_save(sender, instance, created, **kwargs):
     diff_pay = n_pay - o_pay
     
     if diff_rec != 0 or diff_pay != 0:
-        SummaryStats.objects.filter(pk=1).update(
-            total_receivables=F('total_receivables') + diff_rec,
-            total_payables=F('total_payables') + diff_pay
-        )
+        _add_summary_delta('total_receivables', diff_rec)
+        _add_summary_delta('total_payables', diff_pay)
 
-@receiver(post_delete, sender=Party)
+@receiver(post_delete, sender=Party, dispatch_uid='barkat.party_post_delete')
 def party_post_delete(sender, instance, **kwargs):
-    bal = instance.opening_balance or Decimal("0.00")
+    bal = instance.opening_balance or _ZERO
     if instance.opening_balance_side == 'Dr':
-        SummaryStats.objects.filter(pk=1).update(total_receivables=F('total_receivables') - bal)
+        _add_summary_delta('total_receivables', -bal)
     else:
-        SummaryStats.objects.filter(pk=1).update(total_payables=F('total_payables') - bal)
+        _add_summary_delta('total_payables', -bal)
 
 # 6. BankAccount Signals (Opening Balance -> Cash In Hand)
-@receiver(pre_save, sender=BankAccount)
+@receiver(pre_save, sender=BankAccount, dispatch_uid='barkat.bank_pre_save')
 def bank_pre_save(sender, instance, **kwargs):
-    capture_orig(instance, ['opening_balance', 'account_type', 'is_active'])
+    capture_orig(instance, _BANK_FIELDS, kwargs.get('update_fields'))
 
-@receiver(post_save, sender=BankAccount)
+@receiver(post_save, sender=BankAccount, dispatch_uid='barkat.bank_post_save')
 def bank_post_save(sender, instance, created, **kwargs):
+    if _untouched(kwargs.get('update_fields'), _BANK_FIELDS):
+        return
     def get_cash_impact(obj):
         if not obj or not getattr(obj, 'is_active', True): return 0
         if obj.account_type != BankAccount.CASH: return 0
-        return obj.opening_balance or Decimal("0.00")
+        return obj.opening_balance or _ZERO
 
-    class MockBank: pass
-    old_obj = MockBank()
+    old_obj = _OldBank()
     old_obj.opening_balance = getattr(instance, '_orig_opening_balance', 0)
     old_obj.account_type = getattr(instance, '_orig_account_type', BankAccount.BANK)
     old_obj.is_active = getattr(instance, '_orig_is_active', True)
@@ -301,137 +496,188 @@ def bank_post_save(sender, instance, created, **kwargs):
     
     diff = new_c - old_c
     if diff != 0:
-        SummaryStats.objects.filter(pk=1).update(cash_in_hand=F('cash_in_hand') + diff)
+        _add_summary_delta('cash_in_hand', diff)
 
-@receiver(post_delete, sender=BankAccount)
+@receiver(post_delete, sender=BankAccount, dispatch_uid='barkat.bank_post_delete')
 def bank_post_delete(sender, instance, **kwargs):
     if instance.is_active and instance.account_type == BankAccount.CASH:
-        SummaryStats.objects.filter(pk=1).update(cash_in_hand=F('cash_in_hand') - (instance.opening_balance or 0))
+        _add_summary_delta('cash_in_hand', -(instance.opening_balance or 0))
 
 # --- Original Signals ---
 
-@receiver(pre_save, sender=SalesReturn)
+@receiver(pre_save, sender=SalesReturn, dispatch_uid='barkat.sr_pre_save')
 def sr_pre_save(sender, instance, **kwargs):
-    capture_orig(instance, ['net_total', 'status'])
+    capture_orig(instance, _RETURN_FIELDS, kwargs.get('update_fields'))
 
-@receiver(post_save, sender=SalesReturn)
+@receiver(post_save, sender=SalesReturn, dispatch_uid='barkat.sr_post_save')
 def sr_post_save(sender, instance, created, **kwargs):
-    old_total = getattr(instance, '_orig_net_total', Decimal("0.00")) or Decimal("0.00")
+    if _untouched(kwargs.get('update_fields'), ('net_total', 'status', 'business', 'customer', 'is_deleted', 'is_active')):
+        return
+    old_total = getattr(instance, '_orig_net_total', _ZERO) or _ZERO
     old_status = getattr(instance, '_orig_status', None)
-    new_total = instance.net_total or Decimal("0.00")
+    new_total = instance.net_total or _ZERO
     new_status = instance.status
 
     # Sales Return reduces Receivables
-    val_old = old_total if old_status != 'CANCELLED' else Decimal("0.00")
-    val_new = new_total if new_status != 'CANCELLED' else Decimal("0.00")
+    val_old = old_total if old_status != 'CANCELLED' else _ZERO
+    val_new = new_total if new_status != 'CANCELLED' else _ZERO
     
     diff = val_new - val_old
     if diff != 0:
         # Subtract from receivables
-        SummaryStats.objects.filter(pk=1).update(total_receivables=F('total_receivables') - diff)
+        _add_summary_delta('total_receivables', -diff)
 
-    update_business_summary(instance.business_id)
+    enqueue_business_summary(instance.business_id)
+    if instance.customer_id: enqueue_party_balance(instance.customer_id)
 
-@receiver(post_delete, sender=SalesReturn)
+@receiver(post_delete, sender=SalesReturn, dispatch_uid='barkat.sr_post_delete')
 def sr_post_delete(sender, instance, **kwargs):
+    if not instance.net_total:
+        return
     if instance.status != 'CANCELLED':
-        SummaryStats.objects.filter(pk=1).update(total_receivables=F('total_receivables') + (instance.net_total or 0))
-    update_business_summary(instance.business_id)
+        _add_summary_delta('total_receivables', instance.net_total or 0)
+    enqueue_business_summary(instance.business_id)
+    if instance.customer_id: enqueue_party_balance(instance.customer_id)
 
 
-@receiver(pre_save, sender=PurchaseReturn)
+@receiver(pre_save, sender=PurchaseReturn, dispatch_uid='barkat.pr_pre_save')
 def pr_pre_save(sender, instance, **kwargs):
-    capture_orig(instance, ['net_total', 'status'])
+    capture_orig(instance, _RETURN_FIELDS, kwargs.get('update_fields'))
 
-@receiver(post_save, sender=PurchaseReturn)
+@receiver(post_save, sender=PurchaseReturn, dispatch_uid='barkat.pr_post_save')
 def pr_post_save(sender, instance, created, **kwargs):
-    old_total = getattr(instance, '_orig_net_total', Decimal("0.00")) or Decimal("0.00")
+    if _untouched(kwargs.get('update_fields'), ('net_total', 'status', 'business', 'supplier', 'is_deleted', 'is_active')):
+        return
+    old_total = getattr(instance, '_orig_net_total', _ZERO) or _ZERO
     old_status = getattr(instance, '_orig_status', None)
-    new_total = instance.net_total or Decimal("0.00")
+    new_total = instance.net_total or _ZERO
     new_status = instance.status
 
     # Purchase Return reduces Payables
-    val_old = old_total if old_status != 'CANCELLED' else Decimal("0.00")
-    val_new = new_total if new_status != 'CANCELLED' else Decimal("0.00")
+    val_old = old_total if old_status != 'CANCELLED' else _ZERO
+    val_new = new_total if new_status != 'CANCELLED' else _ZERO
     
     diff = val_new - val_old
     if diff != 0:
         # Subtract from payables
-        SummaryStats.objects.filter(pk=1).update(total_payables=F('total_payables') - diff)
+        _add_summary_delta('total_payables', -diff)
 
-    update_business_summary(instance.business_id)
+    enqueue_business_summary(instance.business_id)
+    if instance.supplier_id: enqueue_party_balance(instance.supplier_id)
 
-@receiver(post_delete, sender=PurchaseReturn)
+@receiver(post_delete, sender=PurchaseReturn, dispatch_uid='barkat.pr_post_delete')
 def pr_post_delete(sender, instance, **kwargs):
+    if not instance.net_total:
+        return
     if instance.status != 'CANCELLED':
-        SummaryStats.objects.filter(pk=1).update(total_payables=F('total_payables') + (instance.net_total or 0))
-    update_business_summary(instance.business_id)
+        _add_summary_delta('total_payables', instance.net_total or 0)
+    enqueue_business_summary(instance.business_id)
+    if instance.supplier_id: enqueue_party_balance(instance.supplier_id)
 
 
-def update_business_summary(business_id):
+_SUMMARY_STATS = (
+    'cash_in_hand', 'bank_balance', 'inventory_value',
+    'total_receivables', 'total_payables',
+)
+_SUMMARY_FIELDS = _SUMMARY_STATS + ('last_updated',)
+
+def update_business_summary(business_id, force=False):
+    """
+    Recompute a business's cached summary. Unless `force` is set, the row is
+    left alone (and last_updated untouched) when the totals haven't moved.
+    """
     if not business_id:
         return
 
     from barkat.models import BusinessSummary
     from barkat.services.financial_logic import get_business_financials
 
-    summary, created = BusinessSummary.objects.get_or_create(business_id=business_id)
     stats = get_business_financials(business_id)
-    
-    summary.cash_in_hand = stats['cash_in_hand']
-    summary.bank_balance = stats['bank_balance']
-    summary.inventory_value = stats['inventory_value']
-    summary.total_receivables = stats['total_receivables']
-    summary.total_payables = stats['total_payables']
-
-    summary.save()
+    if not force:
+        current = BusinessSummary.objects.filter(business_id=business_id).values_list(*_SUMMARY_STATS).first()
+        if current == tuple(stats[f] for f in _SUMMARY_STATS):
+            return
+    summary = BusinessSummary(
+        business_id=business_id,
+        cash_in_hand=stats['cash_in_hand'],
+        bank_balance=stats['bank_balance'],
+        inventory_value=stats['inventory_value'],
+        total_receivables=stats['total_receivables'],
+        total_payables=stats['total_payables'],
+    )
+    # One INSERT ... ON CONFLICT DO UPDATE instead of get_or_create + save
+    BusinessSummary.objects.bulk_create(
+        [summary],
+        update_conflicts=True,
+        unique_fields=['business'],
+        update_fields=_SUMMARY_FIELDS,
+    )
 
 # --- Signal Receivers ---
 
-@receiver(post_save, sender=SalesOrder)
-@receiver(post_delete, sender=SalesOrder)
+@receiver(post_save, sender=SalesOrder, dispatch_uid='barkat.on_so_change')
+@receiver(post_delete, sender=SalesOrder, dispatch_uid='barkat.on_so_change')
 def on_so_change(sender, instance, **kwargs):
-    update_business_summary(instance.business_id)
-    if instance.customer_id: update_party_balance(instance.customer_id)
+    if _untouched(kwargs.get('update_fields'), _SO_FIELDS) or _noop_save(instance, _SO_FIELDS, kwargs):
+        return
+    if kwargs.get('signal') is post_delete and not instance.net_total:
+        return
+    enqueue_business_summary(instance.business_id)
+    if instance.customer_id: enqueue_party_balance(instance.customer_id)
 
-@receiver(post_save, sender=SalesInvoice)
-@receiver(post_delete, sender=SalesInvoice)
+@receiver(pre_save, sender=SalesInvoice, dispatch_uid='barkat.inv_pre_save')
+def inv_pre_save(sender, instance, **kwargs):
+    capture_orig(instance, _INV_FIELDS, kwargs.get('update_fields'))
+
+@receiver(post_save, sender=SalesInvoice, dispatch_uid='barkat.on_inv_change')
+@receiver(post_delete, sender=SalesInvoice, dispatch_uid='barkat.on_inv_change')
 def on_inv_change(sender, instance, **kwargs):
-    update_business_summary(instance.business_id)
-    if instance.customer_id: update_party_balance(instance.customer_id)
+    if _untouched(kwargs.get('update_fields'), _INV_FIELDS) or _noop_save(instance, _INV_FIELDS, kwargs):
+        return
+    if kwargs.get('signal') is post_delete and not instance.net_total:
+        return
+    enqueue_business_summary(instance.business_id)
+    if instance.customer_id: enqueue_party_balance(instance.customer_id)
 
-@receiver(post_save, sender=PurchaseOrder)
-@receiver(post_delete, sender=PurchaseOrder)
+@receiver(post_save, sender=PurchaseOrder, dispatch_uid='barkat.on_po_change')
+@receiver(post_delete, sender=PurchaseOrder, dispatch_uid='barkat.on_po_change')
 def on_po_change(sender, instance, **kwargs):
-    update_business_summary(instance.business_id)
-    if instance.supplier_id: update_party_balance(instance.supplier_id)
+    if _untouched(kwargs.get('update_fields'), _PO_FIELDS) or _noop_save(instance, _PO_FIELDS, kwargs):
+        return
+    if kwargs.get('signal') is post_delete and not instance.net_total:
+        return
+    enqueue_business_summary(instance.business_id)
+    if instance.supplier_id: enqueue_party_balance(instance.supplier_id)
 
-@receiver(post_save, sender=Payment)
-@receiver(post_delete, sender=Payment)
+@receiver(post_save, sender=Payment, dispatch_uid='barkat.on_payment_change')
+@receiver(post_delete, sender=Payment, dispatch_uid='barkat.on_payment_change')
 def on_payment_change(sender, instance, **kwargs):
-    update_business_summary(instance.business_id)
-    if instance.party_id: update_party_balance(instance.party_id)
+    if _untouched(kwargs.get('update_fields'), _PAY_FIELDS) or _noop_save(instance, _PAY_FIELDS, kwargs):
+        return
+    enqueue_business_summary(instance.business_id)
+    if instance.party_id: enqueue_party_balance(instance.party_id)
 
-@receiver(post_save, sender=Expense)
-@receiver(post_delete, sender=Expense)
+@receiver(post_save, sender=Expense, dispatch_uid='barkat.on_expense_change')
+@receiver(post_delete, sender=Expense, dispatch_uid='barkat.on_expense_change')
 def on_expense_change(sender, instance, **kwargs):
-    update_business_summary(instance.business_id)
+    if _untouched(kwargs.get('update_fields'), _EXP_FIELDS) or _noop_save(instance, _EXP_FIELDS, kwargs):
+        return
+    enqueue_business_summary(instance.business_id)
 
-@receiver(pre_save, sender=Product)
+@receiver(pre_save, sender=Product, dispatch_uid='barkat.product_pre_save')
 def product_pre_save(sender, instance, **kwargs):
-    capture_orig(instance, ['stock_qty', 'purchase_price', 'is_active', 'is_deleted'])
+    capture_orig(instance, _PROD_FIELDS, kwargs.get('update_fields'))
 
-@receiver(post_save, sender=Product)
+@receiver(post_save, sender=Product, dispatch_uid='barkat.on_product_change')
 def on_product_change(sender, instance, created, **kwargs):
+    if _untouched(kwargs.get('update_fields'), ('stock_qty', 'purchase_price', 'is_active', 'is_deleted', 'business')):
+        return
     def get_val(obj):
         if not obj or getattr(obj, 'is_deleted', False):
-            return Decimal("0.00")
-        qty = Decimal(str(obj.stock_qty or 0))
-        price = Decimal(str(obj.purchase_price or 0))
-        return qty * price
+            return _ZERO
+        return _as_decimal(obj.stock_qty) * _as_decimal(obj.purchase_price)
 
-    class MockProd: pass
-    old_obj = MockProd()
+    old_obj = _OldProd()
     old_obj.stock_qty = getattr(instance, '_orig_stock_qty', 0)
     old_obj.purchase_price = getattr(instance, '_orig_purchase_price', 0)
     old_obj.is_active = getattr(instance, '_orig_is_active', True)
@@ -442,146 +688,154 @@ def on_product_change(sender, instance, created, **kwargs):
     
     diff = new_val - old_val
     if diff != 0:
-        SummaryStats.objects.filter(pk=1).update(total_inventory_valuation=F('total_inventory_valuation') + diff)
+        _add_summary_delta('total_inventory_valuation', diff)
 
-    update_business_summary(instance.business_id)
+    enqueue_business_summary(instance.business_id)
 
-@receiver(post_save, sender=StockMove)
+@receiver(post_save, sender=StockMove, dispatch_uid='barkat.on_stock_move')
 def on_stock_move(sender, instance, **kwargs):
+    if _untouched(kwargs.get('update_fields'), ('status', 'source_business', 'dest_business')):
+        return
     if instance.status == 'POSTED':
-        if instance.source_business_id: update_business_summary(instance.source_business_id)
-        if instance.dest_business_id: update_business_summary(instance.dest_business_id)
-
-@receiver(pre_save, sender=BankMovement)
+        if instance.source_business_id: enqueue_business_summary(instance.source_business_id)
+        if instance.dest_business_id: enqueue_business_summary(instance.dest_business_id)
+
+# movement_type values (always stored lowercase) that move physical cash
+_DEPOSIT_TYPES = frozenset({"deposit", "cash_deposit"})
+_WITHDRAW_TYPES = frozenset({"withdraw", "withdrawal", "cash_withdrawal"})
+
+def _bm_cash_impact(obj):
+    mtype = obj.movement_type
+    if mtype in _DEPOSIT_TYPES:
+        return -(obj.amount or _ZERO)
+    if mtype in _WITHDRAW_TYPES:
+        return obj.amount or _ZERO
+    return 0
+
+@receiver(pre_save, sender=BankMovement, dispatch_uid='barkat.bm_pre_save')
 def bm_pre_save(sender, instance, **kwargs):
-    capture_orig(instance, ['amount', 'movement_type', 'business_id'])
+    capture_orig(instance, _BM_FIELDS, kwargs.get('update_fields'))
 
-@receiver(post_save, sender=BankMovement)
+@receiver(post_save, sender=BankMovement, dispatch_uid='barkat.bm_post_save')
 def bm_post_save(sender, instance, created, **kwargs):
-    def get_cash_impact(obj):
-        if not obj: return 0
-        amt = obj.amount or Decimal("0.00")
-        mtype = (obj.movement_type or "").lower()
-        if mtype in ("deposit", "cash_deposit"):
-            return -amt
-        elif mtype in ("withdraw", "withdrawal", "cash_withdrawal"):
-            return amt
-        return 0
-
-    class MockBM: pass
-    old_obj = MockBM()
+    if _untouched(kwargs.get('update_fields'), ('amount', 'movement_type', 'business', 'party', 'purchase_order', 'is_deleted', 'is_active')):
+        return
+    old_obj = _OldBM()
     old_obj.amount = getattr(instance, '_orig_amount', 0)
     old_obj.movement_type = getattr(instance, '_orig_movement_type', None)
     
-    old_c = get_cash_impact(old_obj)
-    new_c = get_cash_impact(instance)
+    old_c = _bm_cash_impact(old_obj)
+    new_c = _bm_cash_impact(instance)
     
     diff = new_c - old_c
     if diff != 0:
-        SummaryStats.objects.filter(pk=1).update(cash_in_hand=F('cash_in_hand') + diff)
+        _add_summary_delta('cash_in_hand', diff)
 
     # Business summary update
     if instance.business_id:
-        update_business_summary(instance.business_id)
+        enqueue_business_summary(instance.business_id)
     if hasattr(instance, '_orig_business_id') and instance._orig_business_id and instance._orig_business_id != instance.business_id:
-        update_business_summary(instance._orig_business_id)
+        enqueue_business_summary(instance._orig_business_id)
     
     # Existing party balance update
     if instance.party_id: 
-        update_party_balance(instance.party_id)
+        enqueue_party_balance(instance.party_id)
     
     # If linked to PO
-    if instance.purchase_order_id:
-        update_business_summary(instance.purchase_order.business_id)
+    enqueue_po_business_summary(instance)
 
-@receiver(post_delete, sender=BankMovement)
+@receiver(post_delete, sender=BankMovement, dispatch_uid='barkat.bm_post_delete')
 def bm_post_delete(sender, instance, **kwargs):
-    amt = instance.amount or Decimal("0.00")
-    mtype = (instance.movement_type or "").lower()
-    diff = 0
-    if mtype in ("deposit", "cash_deposit"):
-        diff = amt # Reverse negative impact
-    elif mtype in ("withdraw", "withdrawal", "cash_withdrawal"):
-        diff = -amt # Reverse positive impact
+    diff = -_bm_cash_impact(instance) # Reverse the impact
     
     if diff != 0:
-        SummaryStats.objects.filter(pk=1).update(cash_in_hand=F('cash_in_hand') + diff)
+        _add_summary_delta('cash_in_hand', diff)
     
     if instance.business_id:
-        update_business_summary(instance.business_id)
+        enqueue_business_summary(instance.business_id)
     if instance.party_id: 
-        update_party_balance(instance.party_id)
-    if instance.purchase_order_id:
-        update_business_summary(instance.purchase_order.business_id)
+        enqueue_party_balance(instance.party_id)
+    enqueue_po_business_summary(instance)
 
 
 # ==========================================
 # Party Balance Caching Signals (Optimization)
 # ==========================================
 
+# Parties per aggregate/UPDATE round; keeps the CASE parameters well under
+# SQLite's bound-variable limit.
+_PARTY_BALANCE_BATCH = 500
+
 def update_party_balance(party_id):
     """
     Recalculates and caches the party balance.
     """
-    if not party_id:
+    update_party_balances([party_id])
+
+def update_party_balances(party_ids, now=None):
+    """
+    Recalculates and caches the balances of several parties with a single
+    UPDATE ... SET cached_balance = (correlated balance subquery) per batch;
+    the balances never round-trip through Python. Every party in the call
+    gets the same cached_balance_updated_at (`now`, defaulting to the
+    current time).
+    """
+    party_ids = [pid for pid in party_ids if pid]
+    if not party_ids:
         return
-        
-    qs = Party.objects.filter(pk=party_id)
-    # Calculate global balance (business_id=None)
-    qs = get_party_balances(qs) 
-    
-    party = qs.first()
-    if party:
-        net = party.net_balance or Decimal("0.00")
-        
-        # We must use update() to avoid triggering post_save signal recursion if we had one on Party
-        # But currently we don't have a signal on Party save that triggers this.
-        # Still, update() is cleaner for a single field update.
-        Party.objects.filter(pk=party_id).update(
-            cached_balance=net,
-            cached_balance_updated_at=timezone.now()
+    if now is None:
+        now = timezone.now()
+
+    # Calculate global balance (business_id=None) for the row being updated
+    balance = Coalesce(
+        Subquery(get_party_balances(Party.objects.filter(pk=OuterRef('pk'))).values('net_balance')[:1]),
+        Value(_ZERO),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    for start in range(0, len(party_ids), _PARTY_BALANCE_BATCH):
+        chunk = party_ids[start:start + _PARTY_BALANCE_BATCH]
+        # update() never fires Party signals, so this can't recurse into
+        # party_pre_save/party_post_save.
+        Party.objects.filter(pk__in=chunk).update(
+            cached_balance=balance,
+            cached_balance_updated_at=now
         )
 
-@receiver(post_save, sender=SalesOrder)
-@receiver(post_delete, sender=SalesOrder)
-def on_so_party_update(sender, instance, **kwargs):
-    if instance.customer_id:
-        update_party_balance(instance.customer_id)
-
-@receiver(post_save, sender=SalesInvoice)
-@receiver(post_delete, sender=SalesInvoice)
-def on_inv_party_update(sender, instance, **kwargs):
-    if instance.customer_id:
-        update_party_balance(instance.customer_id)
-
-@receiver(post_save, sender=PurchaseOrder)
-@receiver(post_delete, sender=PurchaseOrder)
-def on_po_party_update(sender, instance, **kwargs):
-    if instance.supplier_id:
-        update_party_balance(instance.supplier_id)
-
-@receiver(post_save, sender=PurchaseReturn)
-@receiver(post_delete, sender=PurchaseReturn)
-def on_pr_party_update(sender, instance, **kwargs):
-    if instance.supplier_id:
-        update_party_balance(instance.supplier_id)
-
-@receiver(post_save, sender=SalesReturn)
-@receiver(post_delete, sender=SalesReturn)
-def on_sr_party_update(sender, instance, **kwargs):
-    if instance.customer_id:
-        update_party_balance(instance.customer_id)
-
-@receiver(post_save, sender=Payment)
-@receiver(post_delete, sender=Payment)
-def on_pay_party_update(sender, instance, **kwargs):
-    if instance.party_id:
-        update_party_balance(instance.party_id)
-
-@receiver(post_save, sender=BankMovement)
-@receiver(post_delete, sender=BankMovement)
-def on_bm_party_update(sender, instance, **kwargs):
-    # Only relevance if movement_type is CHEQUE_PAYMENT and party is set
-    # Or generically if it affects party
-    if instance.party_id:
-        update_party_balance(instance.party_id)
+
+# ==========================================
+# Business Summary Report Cache Invalidation
+# ==========================================
+
+_REPORT_MODELS = (
+    SalesOrder, SalesInvoice, PurchaseOrder, PurchaseOrderPayment,
+    SalesReturn, PurchaseReturn, PurchaseReturnRefund,
+    Payment, Expense, CashFlow, BankAccount, BankMovement,
+)
+
+def on_report_data_change(sender, instance, **kwargs):
+    # After commit, so a concurrent reader can't cache pre-commit sections
+    # under the new version
+    transaction.on_commit(business_summary_v2.bump_data_version)
+
+for _model in _REPORT_MODELS:
+    post_save.connect(on_report_data_change, sender=_model, dispatch_uid='barkat.on_report_data_change')
+    post_delete.connect(on_report_data_change, sender=_model, dispatch_uid='barkat.on_report_data_change')
+
+
+# ==========================================
+# Party Balance Cache Invalidation
+# ==========================================
+
+_LEDGER_MODELS = (
+    SalesOrder, SalesInvoice, PurchaseOrder, SalesReturn, PurchaseReturn,
+    Payment, BankMovement, Party,
+)
+
+def on_ledger_data_change(sender, instance, **kwargs):
+    # After commit, so a concurrent reader can't cache pre-commit balances
+    # under the new version
+    transaction.on_commit(bump_ledger_version)
+
+for _model in _LEDGER_MODELS:
+    post_save.connect(on_ledger_data_change, sender=_model, dispatch_uid='barkat.on_ledger_data_change')
+    post_delete.connect(on_ledger_data_change, sender=_model, dispatch_uid='barkat.on_ledger_data_change')
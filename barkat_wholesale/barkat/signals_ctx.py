@@ -0,0 +1,146 @@
+from contextlib import contextmanager
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.utils import timezone
+
+from barkat import signals
+from barkat.models import (
+    SummaryStats, SalesOrder, SalesInvoice, PurchaseOrder, Payment, Expense,
+    Party, BankAccount, SalesReturn, PurchaseReturn, Product, StockMove, BankMovement,
+)
+from barkat.services import balance_service, business_summary_v2
+
+# (signal, receiver, sender) for every financial receiver in barkat.signals.
+# The report-cache receivers stay connected; they only bump a counter.
+_FINANCIAL_RECEIVERS = (
+    (pre_save, signals.so_pre_save, SalesOrder),
+    (post_save, signals.so_post_save, SalesOrder),
+    (post_delete, signals.so_post_delete, SalesOrder),
+    (pre_save, signals.po_pre_save, PurchaseOrder),
+    (post_save, signals.po_post_save, PurchaseOrder),
+    (post_delete, signals.po_post_delete, PurchaseOrder),
+    (pre_save, signals.pay_pre_save, Payment),
+    (post_save, signals.pay_post_save, Payment),
+    (post_delete, signals.pay_post_delete, Payment),
+    (pre_save, signals.exp_pre_save, Expense),
+    (post_save, signals.exp_post_save, Expense),
+    (post_delete, signals.exp_post_delete, Expense),
+    (pre_save, signals.party_pre_save, Party),
+    (post_save, signals.party_post_save, Party),
+    (post_delete, signals.party_post_delete, Party),
+    (pre_save, signals.bank_pre_save, BankAccount),
+    (post_save, signals.bank_post_save, BankAccount),
+    (post_delete, signals.bank_post_delete, BankAccount),
+    (pre_save, signals.sr_pre_save, SalesReturn),
+    (post_save, signals.sr_post_save, SalesReturn),
+    (post_delete, signals.sr_post_delete, SalesReturn),
+    (pre_save, signals.pr_pre_save, PurchaseReturn),
+    (post_save, signals.pr_post_save, PurchaseReturn),
+    (post_delete, signals.pr_post_delete, PurchaseReturn),
+    (post_save, signals.on_so_change, SalesOrder),
+    (post_delete, signals.on_so_change, SalesOrder),
+    (pre_save, signals.inv_pre_save, SalesInvoice),
+    (post_save, signals.on_inv_change, SalesInvoice),
+    (post_delete, signals.on_inv_change, SalesInvoice),
+    (post_save, signals.on_po_change, PurchaseOrder),
+    (post_delete, signals.on_po_change, PurchaseOrder),
+    (post_save, signals.on_payment_change, Payment),
+    (post_delete, signals.on_payment_change, Payment),
+    (post_save, signals.on_expense_change, Expense),
+    (post_delete, signals.on_expense_change, Expense),
+    (pre_save, signals.product_pre_save, Product),
+    (post_save, signals.on_product_change, Product),
+    (post_save, signals.on_stock_move, StockMove),
+    (pre_save, signals.bm_pre_save, BankMovement),
+    (post_save, signals.bm_post_save, BankMovement),
+    (post_delete, signals.bm_post_delete, BankMovement),
+)
+
+# Receivers are process-wide, so nested/concurrent blocks share one disconnect
+_lock = threading.Lock()
+_depth = 0
+
+
+def _disconnect():
+    global _depth
+    with _lock:
+        _depth += 1
+        if _depth == 1:
+            for signal, func, sender in _FINANCIAL_RECEIVERS:
+                signal.disconnect(sender=sender, dispatch_uid=f'barkat.{func.__name__}')
+
+
+def _reconnect():
+    global _depth
+    with _lock:
+        _depth -= 1
+        if _depth == 0:
+            for signal, func, sender in _FINANCIAL_RECEIVERS:
+                signal.connect(func, sender=sender, dispatch_uid=f'barkat.{func.__name__}')
+
+
+def recompute_summary_stats():
+    """
+    Rewrite the SummaryStats row from the ledger in a single UPDATE.
+    suspend_financial_signals runs it on commit, so a rolled-back savepoint
+    drops it and the increments of the enclosing savepoints still apply.
+    """
+    from barkat.services.financial_logic import get_business_financials
+
+    # Batches queued before this one already ran and are overwritten below;
+    # the ones still pending are already in the committed totals
+    for batch in list(signals._delta_batches().values()):
+        batch.clear()
+
+    stats = get_business_financials()
+    values = {
+        'total_receivables': stats['total_receivables'],
+        'total_payables': stats['total_payables'],
+        'cash_in_hand': stats['cash_in_hand'],
+        'total_inventory_valuation': stats['inventory_value'],
+        'last_updated': timezone.now(),
+    }
+    if not signals._SUMMARY_ROW.update(**values):
+        SummaryStats.objects.create(pk=1, **values)
+
+
+@contextmanager
+def suspend_financial_signals(*, businesses=None, parties=None):
+    """
+    Disconnects the financial receivers for a bulk load (bulk_create, imports)
+    and recomputes the totals once on exit instead of once per row.
+
+    Usage:
+        with suspend_financial_signals(businesses=[biz.id], parties=party_ids):
+            SalesOrder.objects.bulk_create(orders)
+
+    On exit the BusinessSummary of every id in `businesses` and the cached
+    balance of every id in `parties` are rebuilt; SummaryStats is rebuilt and
+    the report and ledger cache versions are bumped on commit, like the
+    receivers do. If the block raises, nothing is recomputed.
+
+    bulk_create() and QuerySet.update() send no post_save, so the cache
+    receivers that stay connected never see those rows; the version bumps
+    here cover them.
+
+    The receivers are disconnected for the whole process, not just this
+    thread. Saves on other request threads while the block runs skip their
+    per-business and per-party recomputes; only SummaryStats is rebuilt
+    globally afterwards. Keep the block to maintenance work (imports,
+    management commands) where nothing else is writing.
+    """
+    _disconnect()
+    try:
+        yield
+    finally:
+        _reconnect()
+
+    for business_id in set(businesses or ()):
+        signals.update_business_summary(business_id)
+    if parties:
+        signals.update_party_balances(set(parties))
+    transaction.on_commit(recompute_summary_stats)
+    transaction.on_commit(business_summary_v2.bump_data_version)
+    transaction.on_commit(balance_service.bump_ledger_version)
@@ -1,32 +1,91 @@
-from django.test import TestCase, Client
+from django.db import connection
+from django.db.models.signals import post_save
+from django.http import HttpResponse
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from decimal import Decimal
+from unittest import mock
+from . import views
 from .models import (
     Business, Party, BankAccount, PurchaseOrder, Expense, Payment, CashFlow,
     Product, UnitOfMeasure, ProductCategory
 )
 from django.contrib.auth.models import User
 
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
 class InstantPaymentTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Resolved once per class rather than per test
+        cls.po_add_url = reverse("po_add")
+        cls.finance_reports_url = reverse("finance_reports")
+
+        # Created once for the class; each test runs in its own savepoint
+        cls.user = User.objects.create_superuser(username="admin", password="password", email="admin@example.com")
+        
+        cls.biz = Business.objects.create(name="Test Biz", code="TBZ")
+        cls.supplier = Party.objects.create(display_name="Test Supplier", type=Party.VENDOR)
+        cls.bank = BankAccount.objects.create(name="Test Bank", opening_balance=Decimal("1000.00"))
+        
+        cls.uom = UnitOfMeasure.objects.create(name="Kg", code="KG")
+        cls.cat = ProductCategory.objects.create(name="General", business=cls.biz)
+        # bulk_create skips Product.save()'s barcode generation lookups; the
+        # PO tests don't depend on it, so give the row a fixed barcode instead.
+        [cls.product] = Product.objects.bulk_create([
+            Product(
+                name="Test Product",
+                business=cls.biz,
+                uom=cls.uom,
+                category=cls.cat,
+                purchase_price=Decimal("10.00"),
+                barcode="TEST00000001",
+            )
+        ])
+
+        # PO form payload shared by the PO-creation tests; each test adds its
+        # own expense rows. Prefix for items formset is 'items'.
+        cls.base_po_post = {
+            "business": cls.biz.id,
+            "supplier": cls.supplier.id,
+            "status": "received",
+            "po_date": timezone.localdate().isoformat(),
+            "tax_percent": "0.00",
+            "discount_percent": "0.00",
+            
+            # Formset for items
+            "items-TOTAL_FORMS": "1",
+            "items-INITIAL_FORMS": "0",
+            "items-0-product": cls.product.id,
+            "items-0-quantity": "10",
+            "items-0-unit_price": "10.00",
+            "items-0-uom": cls.uom.id,
+            "items-0-size_per_unit": "1.000000",
+            
+            # Formset for expenses
+            "expenses-TOTAL_FORMS": "1",
+            "expenses-INITIAL_FORMS": "0",
+        }
+
     def setUp(self):
-        self.user = User.objects.create_superuser(username="admin", password="password", email="admin@example.com")
         self.client = Client()
-        self.client.login(username="admin", password="password")
-        
-        self.biz = Business.objects.create(name="Test Biz", code="TBZ")
-        self.supplier = Party.objects.create(display_name="Test Supplier", type=Party.VENDOR)
-        self.bank = BankAccount.objects.create(name="Test Bank", opening_balance=Decimal("1000.00"))
-        
-        self.uom = UnitOfMeasure.objects.create(name="Kg", code="KG")
-        self.cat = ProductCategory.objects.create(name="General", business=self.biz)
-        self.product = Product.objects.create(
-            name="Test Product", 
-            business=self.biz, 
-            uom=self.uom, 
-            category=self.cat,
-            purchase_price=Decimal("10.00")
-        )
+        self.client.force_login(self.user)
+
+    def _capture_po_pks(self):
+        """Record the pk of every PurchaseOrder saved during the test."""
+        pks = []
+
+        def _record(sender, instance, **kwargs):
+            pks.append(instance.pk)
+
+        post_save.connect(_record, sender=PurchaseOrder, weak=False)
+        self.addCleanup(post_save.disconnect, _record, sender=PurchaseOrder)
+        return pks
+
+    def _fetch_po(self, pk):
+        """The PO with its expenses, their payments and cashflows, in two queries."""
+        return PurchaseOrder.objects.with_full_expenses().select_related("supplier").get(pk=pk)
 
     def test_po_creation_with_instant_payment_expense(self):
         """
@@ -36,32 +95,11 @@ class InstantPaymentTest(TestCase):
         3. Payment has correct amount and direction.
         4. Bank account balance is reduced (via CashFlow).
         """
-        url = reverse("po_add")
-        
-        # Prefix for items formset is 'items' as identified by debug prints
-        prefix = "items"
+        url = self.po_add_url
         
         # Prepare form data
         data = {
-            "business": self.biz.id,
-            "supplier": self.supplier.id,
-            "status": "received",
-            "po_date": timezone.localdate().isoformat(),
-            "tax_percent": "0.00",
-            "discount_percent": "0.00",
-            
-            # Formset for items
-            f"{prefix}-TOTAL_FORMS": "1",
-            f"{prefix}-INITIAL_FORMS": "0",
-            f"{prefix}-0-product": self.product.id,
-            f"{prefix}-0-quantity": "10",
-            f"{prefix}-0-unit_price": "10.00",
-            f"{prefix}-0-uom": self.uom.id,
-            f"{prefix}-0-size_per_unit": "1.000000",
-            
-            # Formset for expenses
-            "expenses-TOTAL_FORMS": "1",
-            "expenses-INITIAL_FORMS": "0",
+            **self.base_po_post,
             "expenses-0-category": "freight",
             "expenses-0-amount": "50.00",
             "expenses-0-description": "Instant freight",
@@ -70,6 +108,7 @@ class InstantPaymentTest(TestCase):
             "expenses-0-bank_account": self.bank.id,
         }
         
+        po_pks = self._capture_po_pks()
         response = self.client.post(url, data)
         
         # If it failed, print errors for debugging
@@ -88,21 +127,26 @@ class InstantPaymentTest(TestCase):
         self.assertEqual(response.status_code, 302)
         
         # Verify PO and Expense
-        po = PurchaseOrder.objects.latest("id")
-        self.assertEqual(po.expenses.count(), 1)
-        expense = po.expenses.first()
-        self.assertTrue(expense.is_paid)
-        self.assertIsNotNone(expense.payment)
-        
-        # Verify Payment
-        payment = expense.payment
+        with CaptureQueriesContext(connection) as ctx:
+            po = self._fetch_po(po_pks[-1])
+            expenses = po.expenses.all()
+            self.assertEqual(len(expenses), 1)
+            expense = expenses[0]
+            self.assertTrue(expense.is_paid)
+            self.assertIsNotNone(expense.payment)
+        
+            # Verify Payment
+            payment = expense.payment
+            self.assertEqual(payment.bank_account, self.bank)
+        self.assertLess(len(ctx.captured_queries), 5)
+
         self.assertEqual(payment.amount, Decimal("50.00"))
         self.assertEqual(payment.payment_source, Payment.BANK)
         self.assertEqual(payment.direction, Payment.OUT)
-        self.assertEqual(payment.bank_account, self.bank)
         
         # Verify CashFlow (created for bank payment)
-        cf = CashFlow.objects.filter(bank_account=self.bank).latest("id")
+        cf = payment.cashflow
+        self.assertEqual(cf.bank_account_id, self.bank.id)
         self.assertEqual(cf.amount, Decimal("50.00"))
         self.assertEqual(cf.flow_type, CashFlow.OUT)
         
@@ -120,33 +164,17 @@ class InstantPaymentTest(TestCase):
 
     def test_po_creation_with_unpaid_expense(self):
         """Verify that if is_paid is False, no Payment is created."""
-        url = reverse("po_add")
-        prefix = "items"
+        url = self.po_add_url
         
         data = {
-            "business": self.biz.id,
-            "supplier": self.supplier.id,
-            "status": "received",
-            "po_date": timezone.localdate().isoformat(),
-            "tax_percent": "0.00",
-            "discount_percent": "0.00",
-            
-            f"{prefix}-TOTAL_FORMS": "1",
-            f"{prefix}-INITIAL_FORMS": "0",
-            f"{prefix}-0-product": self.product.id,
-            f"{prefix}-0-quantity": "10",
-            f"{prefix}-0-unit_price": "10.00",
-            f"{prefix}-0-uom": self.uom.id,
-            f"{prefix}-0-size_per_unit": "1.000000",
-            
-            "expenses-TOTAL_FORMS": "1",
-            "expenses-INITIAL_FORMS": "0",
+            **self.base_po_post,
             "expenses-0-category": "freight",
             "expenses-0-amount": "100.00",
             "expenses-0-description": "Unpaid freight",
             # "expenses-0-is_paid" omitted means False
         }
 
+        po_pks = self._capture_po_pks()
         response = self.client.post(url, data)
         
         # Debug prints
@@ -158,8 +186,8 @@ class InstantPaymentTest(TestCase):
         
         self.assertEqual(response.status_code, 302)
 
-        po = PurchaseOrder.objects.latest("id")
-        expense = po.expenses.first()
+        po = self._fetch_po(po_pks[-1])
+        expense = po.expenses.all()[0]
         
         self.assertFalse(expense.is_paid)
         self.assertIsNone(expense.payment)
@@ -200,11 +228,16 @@ class InstantPaymentTest(TestCase):
             date=timezone.localdate()
         )
         
-        url = reverse("finance_reports")
-        response = self.client.get(url)
+        # Only the context is checked, so call the view directly and stub
+        # out render() instead of rendering the whole reports template
+        request = RequestFactory().get(self.finance_reports_url)
+        request.user = self.user
+        with mock.patch.object(views, "render", return_value=HttpResponse()) as render:
+            response = views.finance_reports(request)
         self.assertEqual(response.status_code, 200)
-        
+        context = render.call_args.args[2]
+
         # Check context
-        self.assertEqual(response.context["kpi_landed_po_expenses"], Decimal("100.00"))
-        self.assertEqual(response.context["kpi_operating_expenses"], Decimal("500.00"))
-        self.assertEqual(response.context["kpi_expenses"], Decimal("600.00"))
+        self.assertEqual(context["kpi_landed_po_expenses"], Decimal("100.00"))
+        self.assertEqual(context["kpi_operating_expenses"], Decimal("500.00"))
+        self.assertEqual(context["kpi_expenses"], Decimal("600.00"))
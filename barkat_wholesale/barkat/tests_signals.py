@@ -0,0 +1,281 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import Subquery
+from django.test import TestCase
+
+from . import signals
+from .models import Business, CashFlow, Party, Payment, PurchaseOrder, SummaryStats
+from .services import balance_service, business_summary_v2
+from .signals_ctx import suspend_financial_signals
+
+
+class SignalDeferralTest(TestCase):
+    """
+    Recomputes, SummaryStats increments and cache-version bumps run on commit.
+    TestCase never commits, so each write runs under
+    captureOnCommitCallbacks(execute=True).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.biz = Business.objects.create(name="Signal Biz", code="SGB")
+        cls.party = Party.objects.create(display_name="Signal Customer", type=Party.CUSTOMER)
+
+    def setUp(self):
+        # Ids queued by a rolled-back savepoint stay queued for the thread's
+        # next flush; start each test from an empty queue
+        signals._pending.__dict__.clear()
+        # The cache outlives each test's rolled-back database
+        caches["default"].clear()
+
+    def _payment(self, **kwargs):
+        fields = dict(
+            business=self.biz, party=self.party, direction=Payment.IN,
+            amount=Decimal("250.00"), payment_method=Payment.PaymentMethod.CASH,
+        )
+        fields.update(kwargs)
+        return Payment(**fields)
+
+    def test_report_version_bumped_on_commit_only(self):
+        before = business_summary_v2._data_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self._payment().save()
+            self.assertEqual(business_summary_v2._data_version(), before)
+        self.assertGreater(business_summary_v2._data_version(), before)
+
+    def test_report_version_not_bumped_by_rolled_back_savepoint(self):
+        before = business_summary_v2._data_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._payment().save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(business_summary_v2._data_version(), before)
+
+    def test_ledger_version_bumped_on_commit_only(self):
+        self.assertEqual(balance_service.get_cached_party_net_balances()[self.party.id], Decimal("0.00"))
+        with self.captureOnCommitCallbacks(execute=True):
+            self._payment().save()
+            self.assertEqual(balance_service.get_cached_party_net_balances()[self.party.id], Decimal("0.00"))
+        self.assertEqual(balance_service.get_cached_party_net_balances()[self.party.id], Decimal("-250.00"))
+
+    def test_recomputes_deferred_and_coalesced_until_commit(self):
+        with mock.patch.object(signals, "update_business_summary") as update_summary, \
+             mock.patch.object(signals, "update_party_balances") as update_balances:
+            with self.captureOnCommitCallbacks(execute=True):
+                for _ in range(3):
+                    self._payment().save()
+                update_summary.assert_not_called()
+                update_balances.assert_not_called()
+        update_summary.assert_called_once_with(self.biz.id)
+        update_balances.assert_called_once()
+        self.assertEqual(set(update_balances.call_args.args[0]), {self.party.id})
+
+    def test_rolled_back_savepoint_schedules_no_recompute(self):
+        with mock.patch.object(signals, "update_business_summary") as update_summary:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                try:
+                    with transaction.atomic():
+                        self._payment().save()
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+        self.assertEqual(callbacks, [])
+        update_summary.assert_not_called()
+
+    def test_summary_increments_of_rolled_back_savepoint_discarded(self):
+        before = SummaryStats.get_stats().cash_in_hand
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self._payment(amount=Decimal("10.00")).save()
+                try:
+                    with transaction.atomic():
+                        self._payment(amount=Decimal("1000.00")).save()
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+            self.assertEqual(SummaryStats.get_stats().cash_in_hand, before)
+        self.assertEqual(SummaryStats.get_stats().cash_in_hand, before + Decimal("10.00"))
+
+    def test_soft_deleting_cash_payment_reverses_totals(self):
+        before = SummaryStats.get_stats().cash_in_hand
+        with self.captureOnCommitCallbacks(execute=True):
+            payment = self._payment()
+            payment.save()
+        self.assertIsNotNone(payment.cashflow_id)
+        self.assertEqual(SummaryStats.get_stats().cash_in_hand, before + payment.amount)
+
+        # The soft-delete path re-saves only cashflow/updated_* before dropping
+        # the mirrored CashFlow row
+        payment.is_deleted = True
+        with mock.patch.object(signals, "update_business_summary") as update_summary:
+            with self.captureOnCommitCallbacks(execute=True):
+                payment.save()
+        self.assertEqual(SummaryStats.get_stats().cash_in_hand, before)
+        update_summary.assert_called_once_with(self.biz.id)
+
+    def test_po_active_toggle_recomputes_supplier_and_noop_save_does_not(self):
+        user = User.objects.create_user(username="po-signals")
+        supplier = Party.objects.create(display_name="Signal Supplier", type=Party.VENDOR)
+        with self.captureOnCommitCallbacks(execute=True):
+            po = PurchaseOrder.objects.create(
+                business=self.biz, supplier=supplier, net_total=Decimal("500.00"),
+                created_by=user, updated_by=user,
+            )
+
+        # get_party_balances filters purchase orders on is_active
+        with mock.patch.object(signals, "update_party_balances") as update_balances:
+            with self.captureOnCommitCallbacks(execute=True):
+                po.is_active = False
+                po.save(update_fields=["is_active", "updated_at"])
+        update_balances.assert_called_once()
+        self.assertEqual(set(update_balances.call_args.args[0]), {supplier.id})
+
+        with mock.patch.object(signals, "update_party_balances") as update_balances:
+            with self.captureOnCommitCallbacks(execute=True):
+                po.save()
+        update_balances.assert_not_called()
+
+
+class SuspendFinancialSignalsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.biz = Business.objects.create(name="Bulk Biz", code="BLK")
+        cls.party = Party.objects.create(display_name="Bulk Customer", type=Party.CUSTOMER)
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_bulk_load_recomputes_once_and_invalidates_caches(self):
+        self.assertEqual(balance_service.get_cached_party_net_balances()[self.party.id], Decimal("0.00"))
+        report_before = business_summary_v2._data_version()
+
+        with mock.patch.object(signals, "update_business_summary") as update_summary, \
+             mock.patch.object(signals, "update_party_balances") as update_balances:
+            with self.captureOnCommitCallbacks(execute=True):
+                with suspend_financial_signals(businesses=[self.biz.id], parties=[self.party.id]):
+                    # bulk_create sends no post_save at all
+                    Payment.objects.bulk_create([
+                        Payment(business=self.biz, party=self.party, direction=Payment.IN, amount=Decimal("100.00"))
+                        for _ in range(3)
+                    ])
+                    update_summary.assert_not_called()
+        update_summary.assert_called_once_with(self.biz.id)
+        update_balances.assert_called_once_with({self.party.id})
+
+        self.assertGreater(business_summary_v2._data_version(), report_before)
+        self.assertEqual(balance_service.get_cached_party_net_balances()[self.party.id], Decimal("-300.00"))
+
+        # Receivers are connected again afterwards
+        with mock.patch.object(signals, "update_business_summary") as update_summary:
+            with self.captureOnCommitCallbacks(execute=True):
+                Payment(business=self.biz, party=self.party, direction=Payment.IN, amount=Decimal("5.00")).save()
+        update_summary.assert_called_once_with(self.biz.id)
+
+    def _cash_payment(self, amount):
+        Payment(
+            business=self.biz, party=self.party, direction=Payment.IN,
+            amount=Decimal(amount), payment_method=Payment.PaymentMethod.CASH,
+        ).save()
+
+    def test_rolled_back_bulk_load_keeps_outer_increments(self):
+        before = SummaryStats.get_stats().cash_in_hand
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self._cash_payment("10.00")
+                try:
+                    with transaction.atomic():
+                        with suspend_financial_signals():
+                            pass
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+        self.assertEqual(SummaryStats.get_stats().cash_in_hand, before + Decimal("10.00"))
+
+    def test_committed_bulk_load_does_not_double_count_outer_increments(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self._cash_payment("10.00")
+                with transaction.atomic():
+                    with suspend_financial_signals():
+                        pass
+                self._cash_payment("5.00")
+        self.assertEqual(SummaryStats.get_stats().cash_in_hand, Decimal("15.00"))
+
+
+class PartyBalanceSubqueryTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.biz = Business.objects.create(name="Balance Biz", code="BAL")
+        cls.party_a = Party.objects.create(display_name="Party A", type=Party.CUSTOMER)
+        cls.party_b = Party.objects.create(display_name="Party B", type=Party.CUSTOMER)
+        Payment.objects.bulk_create([
+            Payment(business=cls.biz, party=cls.party_b, direction=Payment.IN, amount=Decimal("100.00")),
+        ])
+
+    def test_balances_correlate_to_their_own_party_alias(self):
+        # Party B's balance as a subquery of a query over party A: the sums
+        # must follow the inner (aliased) Party, not the outer row
+        inner = balance_service.get_party_balances(Party.objects.filter(pk=self.party_b.pk))
+        row = Party.objects.filter(pk=self.party_a.pk).annotate(
+            other=Subquery(inner.values("net_balance")[:1])
+        ).get()
+        self.assertEqual(row.other, Decimal("-100.00"))
+
+    def test_update_party_balances(self):
+        signals.update_party_balances([self.party_a.pk, self.party_b.pk])
+        self.assertEqual(
+            dict(Party.objects.filter(pk__in=[self.party_a.pk, self.party_b.pk]).values_list("pk", "cached_balance")),
+            {self.party_a.pk: Decimal("0.00"), self.party_b.pk: Decimal("-100.00")},
+        )
+
+
+class SharedCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.party = Party.objects.create(display_name="Cache Customer", type=Party.CUSTOMER)
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_ledger_bump_from_another_connection_changes_the_key(self):
+        # LocMemCache is per process: bumps made by management commands
+        # would never reach the server
+        self.assertNotIsInstance(caches["default"], LocMemCache)
+
+        balance_service.get_cached_party_net_balances()
+        before = caches["default"].get(balance_service._LEDGER_VERSION_KEY)
+
+        # A fresh connection to the same backend, as another process opens it
+        other = caches.create_connection("default")
+        Party.objects.filter(pk=self.party.pk).update(opening_balance=Decimal("40.00"))
+        with mock.patch.object(balance_service, "cache", other):
+            balance_service.bump_ledger_version()
+
+        self.assertNotEqual(caches["default"].get(balance_service._LEDGER_VERSION_KEY), before)
+        self.assertEqual(balance_service.get_cached_party_net_balances()[self.party.id], Decimal("40.00"))
+
+    def test_report_sections_refresh_after_bump_from_another_connection(self):
+        biz = Business.objects.create(name="Report Biz", code="RPT")
+        report = business_summary_v2.BusinessSummaryReportV2(biz, date(2000, 1, 1), date(2999, 12, 31))
+        self.assertEqual(report.get_current_position()["cash_in_hand"], Decimal("0.00"))
+
+        # A write the server never saw, then the bump another process makes
+        with mock.patch.object(signals, "on_report_data_change"):
+            Payment.objects.bulk_create([
+                Payment(business=biz, party=self.party, direction=Payment.IN, amount=Decimal("75.00")),
+            ])
+            CashFlow.objects.create(business=biz, flow_type=CashFlow.IN, amount=Decimal("75.00"))
+        self.assertEqual(report.get_current_position()["cash_in_hand"], Decimal("0.00"))
+
+        with mock.patch.object(business_summary_v2, "cache", caches.create_connection("default")):
+            business_summary_v2.bump_data_version()
+        self.assertEqual(report.get_current_position()["cash_in_hand"], Decimal("75.00"))
@@ -1,3 +1,4 @@
+from decimal import Decimal
 
 # =========================
 # Unified Ledger Aggregation (Phase 4)
@@ -23,64 +24,42 @@ def get_party_balances(qs, business_id=None):
     Balances are calculated per Party. 
     If business_id is provided, filters transactions by business.
     """
-    from django.db.models import Sum, Q, Case, When, F, Value, DecimalField
+    from django.db.models import Sum, Q, F, DecimalField, OuterRef, Subquery
     from django.db.models.functions import Coalesce
-    
-    # 1. SalesOrder Dr
-    so_filter = Q(sales_orders__status__in=["open", "fulfilled"])  # Exclude cancelled
-    if business_id:
-        so_filter &= Q(sales_orders__business_id=business_id)
-    
-    # 2. SalesInvoice Dr
-    inv_filter = Q()
-    if business_id:
-        inv_filter &= Q(sales_invoices__business_id=business_id)
-        
-    # 3. PurchaseReturn Dr
-    pr_filter = Q()
-    if business_id:
-        pr_filter &= Q(purchase_returns__business_id=business_id)
-        
-    # 4. Payment OUT Dr
-    pay_out_filter = Q(payments__direction="out")
-    if business_id:
-        pay_out_filter &= Q(payments__business_id=business_id)
-    else:
-        # Exclude deleted businesses logic if needed? 
-        # ledger_views implies explicit business check or all.
-        # We'll stick to basic filter.
-        pass
-
-    # 5. PurchaseOrder Cr
-    po_filter = Q()  # ledger.py doesn't filter status for POs in supplier_rows
-    if business_id:
-        po_filter &= Q(purchase_orders__business_id=business_id)
-        
-    # 6. SalesReturn Cr
-    sr_filter = Q()
-    if business_id:
-        sr_filter &= Q(sales_returns__business_id=business_id)
-        
-    # 7. Payment IN Cr
-    pay_in_filter = Q(payments__direction="in")
-    if business_id:
-        pay_in_filter &= Q(payments__business_id=business_id)
+    from barkat.models import SalesOrder, SalesInvoice, PurchaseReturn, Payment, PurchaseOrder, SalesReturn
 
-    # Helper for sum
-    def _sum(field, filter_q):
-        return Coalesce(Sum(field, filter=filter_q), Decimal("0.00"))
+    # Each relation is summed in its own correlated subquery. Joining all of
+    # them in one GROUP BY multiplies every party's rows across relations.
+    def _sum(model, link_field, amount_field, extra_filter=None):
+        sub_qs = model.objects.filter(**{link_field: OuterRef("pk")})
+        if business_id:
+            sub_qs = sub_qs.filter(business_id=business_id)
+        if extra_filter is not None:
+            sub_qs = sub_qs.filter(extra_filter)
+        return Coalesce(
+            Subquery(
+                sub_qs.order_by()
+                .values(link_field)
+                .annotate(total=Sum(amount_field))
+                .values("total"),
+                output_field=DecimalField(),
+            ),
+            Decimal("0.00"),
+            output_field=DecimalField(),
+        )
 
+    # Stage 1: per-relation aggregates only
     qs = qs.annotate(
         # --- DR ---
-        dr_so=_sum("sales_orders__net_total", so_filter),
-        dr_inv=_sum("sales_invoices__net_total", inv_filter),
-        dr_pr=_sum("purchase_returns__net_total", pr_filter),
-        dr_pay=_sum("payments__amount", pay_out_filter),
+        dr_so=_sum(SalesOrder, "customer", "net_total", Q(status__in=["open", "fulfilled"])),  # Exclude cancelled
+        dr_inv=_sum(SalesInvoice, "customer", "net_total"),
+        dr_pr=_sum(PurchaseReturn, "supplier", "net_total"),
+        dr_pay=_sum(Payment, "party", "amount", Q(direction="out")),
 
         # --- CR ---
-        cr_po=_sum("purchase_orders__net_total", po_filter),
-        cr_sr=_sum("sales_returns__net_total", sr_filter),
-        cr_pay=_sum("payments__amount", pay_in_filter),
+        cr_po=_sum(PurchaseOrder, "supplier", "net_total"),  # ledger.py doesn't filter status for POs in supplier_rows
+        cr_sr=_sum(SalesReturn, "customer", "net_total"),
+        cr_pay=_sum(Payment, "party", "amount", Q(direction="in")),
     )
     
     # Now aggregate into total_dr / total_cr including opening balance
@@ -92,13 +71,12 @@ def get_party_balances(qs, business_id=None):
     # Logic in LedgersListView lines 763/821 handles opening balance separately.
     # But usually OB is a single global starting point for the Party entity.
     # Let's include it.
-    
+
+    # Stage 2: totals per party row, opening balance included
+    # (Party.opening_dr / opening_cr are stored generated columns)
     qs = qs.annotate(
-        final_dr=F("dr_so") + F("dr_inv") + F("dr_pr") + F("dr_pay") + 
-                 Case(When(opening_balance_side='Dr', then=F('opening_balance')), default=Decimal(0), output_field=DecimalField()),
-        
-        final_cr=F("cr_po") + F("cr_sr") + F("cr_pay") + 
-                 Case(When(opening_balance_side='Cr', then=F('opening_balance')), default=Decimal(0), output_field=DecimalField()),
+        final_dr=F("dr_so") + F("dr_inv") + F("dr_pr") + F("dr_pay") + F("opening_dr"),
+        final_cr=F("cr_po") + F("cr_sr") + F("cr_pay") + F("opening_cr"),
     )
     
     qs = qs.annotate(
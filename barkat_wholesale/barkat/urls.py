@@ -7,6 +7,7 @@ from .ledger_views import LedgersListView, LedgerDetailView, PartySummaryView, B
 from .pos_print_views import PrintSalesOrderReceiptView, DebugListPrintersView,SaveAndPrintOrderView
 from .quick_receipt_views import QuickReceiptPrintView,QuickReceiptCreateView,QuickReceiptUpdateView
 from . import cash_out_views as from_cash_out
+from . import business_summary_v2 as bsv2
 
 urlpatterns = [
     # Dashboard / Businesses
@@ -217,41 +218,8 @@ urlpatterns = [
     path("pos/print/debug/printers/", DebugListPrintersView.as_view(), name="pos_print_debug_printers"),
     path("pos/save-and-print/", SaveAndPrintOrderView.as_view(), name="pos_save_and_print"),
 
+    # Business Summary Report V2
+    path("business-summary/", bsv2.business_summary_report_view, name="report"),
+    path("business-summary/export/json/", bsv2.business_summary_json_export, name="export_json"),
+    path("business-summary/print/", bsv2.business_summary_print_view, name="print"),
 ]
-
-# barkat/urls.py
-
-# barkat/urls/business_summary_v2.py
-"""
-URL Configuration for Business Summary Report V2
-"""
-from django.urls import path
-from .business_summary_v2 import (
-    business_summary_report_view,
-    business_summary_json_export,
-    business_summary_print_view,
-)
-
-urlpatterns += [
-    # Main report view
-    path(
-        'business-summary/',
-        business_summary_report_view,
-        name='report'
-    ),
-    
-    # JSON export
-    path(
-        'business-summary/export/json/',
-        business_summary_json_export,
-        name='export_json'
-    ),
-    
-    # Print view
-    path(
-        'business-summary/print/',
-        business_summary_print_view,
-        name='print'
-    ),
-]
-
@@ -4,11 +4,23 @@ from barkat.models import UserSettings
 
 
 def user_has_cancellation_password(request):
-    """True if the current user has a cancellation password set in UserSettings."""
+    """
+    True if the current user has a cancellation password set in UserSettings.
+    The answer is memoized on the request, so repeated checks in one view cost
+    a single query.
+    """
     if not getattr(request, "user", None) or not request.user.is_authenticated:
         return False
-    try:
-        us = UserSettings.objects.get(user=request.user)
-        return bool((getattr(us, "cancellation_password", None) or "").strip())
-    except UserSettings.DoesNotExist:
-        return False
+    cached = getattr(request, "_has_cancel_pw", None)
+    if cached is not None:
+        return cached
+    # Single column, no model instance, and no DoesNotExist path. user is a
+    # OneToOneField, so this is a unique-index lookup.
+    pw = (
+        UserSettings.objects.filter(user=request.user)
+        .values_list("cancellation_password", flat=True)
+        .first()
+    )
+    result = bool((pw or "").strip())
+    request._has_cancel_pw = result
+    return result
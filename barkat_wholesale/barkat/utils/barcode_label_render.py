@@ -4,6 +4,11 @@ Generate barcode label images for printing.
 38x28mm per label, 2 labels per row (2 columns).
 Total media width: 80-82mm at 300 DPI.
 """
+import hashlib
+import math
+import os
+import threading
+from functools import lru_cache
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 from typing import List, Dict, Optional, Any
@@ -17,7 +22,6 @@ except ImportError:
 
 try:
     from barcode import Code128
-    from barcode.writer import ImageWriter
     BARCODE_LIB_AVAILABLE = True
 except ImportError:
     BARCODE_LIB_AVAILABLE = False
@@ -70,6 +74,7 @@ BARCODE_MODULE_WIDTH_MM = 0.38  # 15 mils = 3 pixels at 203 DPI (optimal for sca
 # Height should be sufficient for scanner to read (minimum 6mm, recommended 8-10mm)
 BARCODE_MODULE_HEIGHT_MM = 8.0  # bar height in mm (good balance of size and scannability)
 MIN_BARCODE_MODULE_WIDTH_MM = 0.30  # Minimum 12 mils (0.30mm = ~2.4 pixels) - do not go below
+BARCODE_MARGIN_MM = 1.0  # white band above and below the bars (python-barcode's default margin)
 
 
 def _render_code128_fitted(
@@ -82,7 +87,8 @@ def _render_code128_fitted(
     Render a Code128 barcode that fits the requested pixel area WITHOUT resizing.
 
     Why: resizing distorts bar/module widths, which is the #1 cause of scan failures.
-    We instead adjust module_width/module_height and re-render until it fits.
+    We instead pick module_width/module_height from the bar pattern's module
+    count and render once.
     
     CRITICAL for scanning:
     - Module width must be integer multiples of printer pixels (203 DPI = 0.125mm per pixel)
@@ -97,79 +103,41 @@ def _render_code128_fitted(
         max_barcode_height_px = int(available_height_px * 0.6)
         target_height_mm = min(float(BARCODE_MODULE_HEIGHT_MM), _px_to_mm(max_barcode_height_px))
 
-        # Start with optimal module width (15 mils = 3 pixels at 203 DPI)
-        module_w = float(BARCODE_MODULE_WIDTH_MM)
-        min_w = float(MIN_BARCODE_MODULE_WIDTH_MM)
-
-        # Ensure module width aligns with printer pixels (203 DPI = 0.125mm per pixel)
-        # Round to nearest pixel boundary for better scanning
+        # Module width in whole printer pixels (203 DPI = 0.125mm per pixel):
+        # the recommended 15 mils, narrower if that is what fits, but never
+        # below the 12 mil minimum or 2 pixels
         pixels_per_mm = DPI / 25.4
-        module_w_pixels = module_w * pixels_per_mm
-        # Round to nearest integer pixel for better alignment
-        module_w_pixels = round(module_w_pixels)
+        max_module_px = round(float(BARCODE_MODULE_WIDTH_MM) * pixels_per_mm)
+        min_module_px = max(2, math.ceil(float(MIN_BARCODE_MODULE_WIDTH_MM) * pixels_per_mm))
+
+        # build() returns the bar pattern, one character per module ("1" = bar)
+        pattern = Code128(barcode_value).build()[0]
+        modules = len(pattern)
+        module_w_pixels = max(min_module_px, min(max_module_px, barcode_width_usable_px // modules))
         module_w = module_w_pixels / pixels_per_mm
 
-        # Try a few widths, decreasing until it fits (but maintain pixel alignment)
-        best_barcode = None
-        for attempt in range(15):
-            # Ensure module width is at least minimum and aligns with pixels
-            if module_w < min_w:
-                break
-            
-            # Re-align to pixels
-            module_w_pixels = round(module_w * pixels_per_mm)
-            if module_w_pixels < 2:  # Minimum 2 pixels
-                break
-            module_w = module_w_pixels / pixels_per_mm
-            
-            writer_options = {
-                "module_width": module_w,
-                "module_height": max(1.0, float(target_height_mm)),
-                "quiet_zone": 0,  # we draw quiet zone ourselves
-                "dpi": DPI,
-                "write_text": False,
-                "font_size": 0,
-                "text_distance": 0,
-                # Additional options for better quality
-                "center_text": False,
-                "background": "white",
-                "foreground": "black",
-            }
-
-            code128 = Code128(barcode_value, writer=ImageWriter())
-            barcode_img = code128.render(writer_options)
-            # CRITICAL: Force 1-bit monochrome for sharp edges (no anti-aliasing)
-            # This ensures bars are pure black/white, which scanners require
-            barcode_img = barcode_img.convert("1", dither=Image.NONE)
-            
-            if barcode_img.mode != "RGB":
-                barcode_img = barcode_img.convert("RGB")
+        # Paint the modules directly rather than through ImageWriter (which
+        # converts every bar via mm and lets widths drift by a pixel): one
+        # pixel per module, NEAREST-upscaled, so each bar is an exact multiple
+        # of module_w_pixels and pure black/white. Vertical geometry matches
+        # ImageWriter with no text: bars between BARCODE_MARGIN_MM margins.
+        margin_px = BARCODE_MARGIN_MM * pixels_per_mm
+        bar_height_px = max(1.0, float(target_height_mm)) * pixels_per_mm
+        bar_top = int(margin_px)
+        bar_bottom = int(margin_px + bar_height_px)
+        image_height = int(2 * margin_px + bar_height_px)
+
+        row = Image.frombytes("L", (modules, 1), bytes(0 if m == "1" else 255 for m in pattern))
+        bars = row.resize((modules * module_w_pixels, bar_bottom - bar_top + 1), Image.NEAREST)
+        barcode_img = Image.new("L", (bars.width, image_height), 255)
+        barcode_img.paste(bars, (0, bar_top))
 
+        if debug:
             w, h = barcode_img.size
-            if w <= barcode_width_usable_px and h <= max_barcode_height_px:
-                if debug:
-                    print(f"  ✓ Barcode rendered: {w}x{h}px, module_width={module_w:.3f}mm ({module_w_pixels:.1f}px)")
-                return barcode_img
-            
-            # Store best attempt so far
-            if best_barcode is None or (w <= barcode_width_usable_px * 1.1 and h <= max_barcode_height_px * 1.1):
-                best_barcode = barcode_img
-
-            # Too wide/tall: reduce module width by one pixel
-            if module_w_pixels > 2:
-                module_w_pixels -= 1
-                module_w = module_w_pixels / pixels_per_mm
+            if w <= barcode_width_usable_px:
+                print(f"  ✓ Barcode rendered: {w}x{h}px, module_width={module_w:.3f}mm ({module_w_pixels}px)")
             else:
-                break
-
-        # Return best attempt if we have one, otherwise last render
-        if best_barcode is not None:
-            if debug:
-                print(f"  ⚠️  Using best fit barcode (may be slightly oversized)")
-            return best_barcode
-        
-        if debug:
-            print(f"  ⚠️  Using last render attempt")
+                print(f"  ⚠️  Barcode wider than usable area at minimum module width: {w}px > {barcode_width_usable_px}px")
         return barcode_img
     except Exception as e:
         if debug:
@@ -195,6 +163,178 @@ TOTAL_LABELS_WIDTH_PX = _mm_to_px(TOTAL_LABELS_WIDTH_MM)
 # Starting X position for labels
 START_X_PX = SIDE_MARGIN_PX
 
+# Label origin per column, and distance between row tops (label + gap sensor gap)
+COLUMN_X_PX = tuple(
+    START_X_PX + col * (LABEL_WIDTH_PX + HORIZONTAL_GAP_PX) for col in range(BARCODES_PER_ROW)
+)
+ROW_PITCH_PX = LABEL_HEIGHT_PX + VERTICAL_GAP_PX
+
+# Label content layout, in label-local pixels
+LABEL_WIDTH_USABLE_PX = LABEL_WIDTH_PX - (LABEL_PADDING_PX * 2)
+BUSINESS_LINE_PX = int(10 * DPI / 96)  # business name line incl. spacing
+PRODUCT_LINE_PX = int(12 * DPI / 96)  # per product-name line
+PRODUCT_GAP_PX = int(3 * DPI / 96)  # after the product name block
+PRICE_LINE_PX = int(10 * DPI / 96)  # price line incl. spacing
+
+# Barcode area: usable width = label width - (2 * padding) - (2 * quiet zone).
+# This keeps at least 2mm white space on each side of the barcode; the quiet
+# zone is critical for the scanner to detect start/stop patterns.
+BARCODE_WIDTH_USABLE_PX = LABEL_WIDTH_USABLE_PX - (QUIET_ZONE_PX * 2)
+MIN_BARCODE_WIDTH_PX = _mm_to_px(20.0)  # at least 20mm for the barcode
+if BARCODE_WIDTH_USABLE_PX < MIN_BARCODE_WIDTH_PX:
+    # Give up the padding to keep the minimum barcode width
+    BARCODE_WIDTH_USABLE_PX = LABEL_WIDTH_PX - (QUIET_ZONE_PX * 2)
+    BARCODE_AREA_LEFT_PX = QUIET_ZONE_PX
+else:
+    # Left edge of barcode area = label left + padding + quiet zone
+    BARCODE_AREA_LEFT_PX = LABEL_PADDING_PX + QUIET_ZONE_PX
+
+FONT_SIZES = {
+    "tiny": int(8 * DPI / 96),
+    "small": int(9 * DPI / 96),
+    "medium": int(10 * DPI / 96),
+    "barcode": int(8 * DPI / 96),
+}
+
+
+@lru_cache(maxsize=None)
+def _label_fonts() -> Dict[str, Any]:
+    """Label fonts, loaded on first use and shared by later renders."""
+    # Try to load fonts (fallback to default if not available)
+    try:
+        # Label text is plain Latin: the basic FreeType layout skips raqm shaping
+        return {
+            name: ImageFont.truetype("arial.ttf", size, layout_engine=ImageFont.Layout.BASIC)
+            for name, size in FONT_SIZES.items()
+        }
+    except OSError:
+        # Fallback - scale default font
+        default_font = ImageFont.load_default()
+        return {name: default_font for name in FONT_SIZES}
+
+
+def _build_single_label(
+    product: Dict,
+    business_text: Optional[str],
+    fonts: Dict[str, Any],
+    debug: bool = False,
+) -> Image.Image:
+    """
+    Draw one complete label (business name, product name, price, barcode and
+    barcode number) on its own LABEL_WIDTH_PX x LABEL_HEIGHT_PX image.
+    Anything that would fall outside the label (e.g. into the die-cut gap)
+    is clipped.
+    """
+    tile = Image.new("L", (LABEL_WIDTH_PX, LABEL_HEIGHT_PX), color=255)
+    draw = ImageDraw.Draw(tile)
+
+    product_name = product.get("name", "")
+    barcode_value = product.get("barcode", "")
+
+    # Draw label content
+    current_y = LABEL_PADDING_PX
+    label_center_x = LABEL_WIDTH_PX / 2
+
+    # Text is centred with anchor="ma" (middle/ascender), so PIL centres it
+    # itself and no widths need measuring
+    # 1. Draw Business Name (top, center-aligned)
+    if business_text:
+        draw.text(
+            (label_center_x, current_y),
+            business_text,
+            fill=0,
+            font=fonts["tiny"],
+            anchor="ma",
+        )
+        current_y += BUSINESS_LINE_PX
+
+    # 2. Draw Product Name (middle, center-aligned)
+    product_lines = _wrap_text(product_name, fonts["medium"], LABEL_WIDTH_USABLE_PX, max_lines=2)
+    if not product_lines:
+        product_lines = [product_name[:18] + "..." if len(product_name) > 18 else product_name]
+
+    for idx, line in enumerate(product_lines[:2]):
+        draw.text(
+            (label_center_x, current_y + (idx * PRODUCT_LINE_PX)),
+            line,
+            fill=0,
+            font=fonts["medium"],
+            anchor="ma",
+        )
+
+    current_y += len(product_lines) * PRODUCT_LINE_PX + PRODUCT_GAP_PX
+
+    # 2.5 Draw Price (optional, center-aligned)
+    price_text = _get_price_text(product)
+    if price_text:
+        draw.text(
+            (label_center_x, current_y),
+            price_text,
+            fill=0,
+            font=fonts["small"],
+            anchor="ma",
+        )
+        current_y += PRICE_LINE_PX
+
+    # 3. Draw Barcode (bottom, with quiet zones, center-aligned)
+    # CRITICAL: Quiet zones must be at least 2mm on left and right for scanning
+    # For Code128, quiet zone should be 10x the X-dimension minimum
+    # With X-dimension of 0.38mm, quiet zone should be ~3.8mm, but we use 2mm minimum
+    available_height = LABEL_HEIGHT_PX - current_y - LABEL_PADDING_PX
+
+    barcode_start_y = current_y
+
+    # Use actual barcode library if available for scannable barcodes
+    actual_barcode_height = 0
+    if BARCODE_LIB_AVAILABLE:
+        try:
+            # Generate Code128 that FITS without resizing (future-proof scanning)
+            barcode_img = _render_code128_fitted(
+                barcode_value=barcode_value,
+                barcode_width_usable_px=BARCODE_WIDTH_USABLE_PX,
+                available_height_px=int(available_height),
+                debug=debug,
+            )
+            if barcode_img is None:
+                raise RuntimeError("Barcode render returned None")
+
+            barcode_img_width, barcode_img_height = barcode_img.size
+
+            # Center the barcode horizontally within the barcode area
+            barcode_img_x = BARCODE_AREA_LEFT_PX + ((BARCODE_WIDTH_USABLE_PX - barcode_img_width) // 2)
+
+            # CRITICAL: Paste barcode using exact pixel coordinates (no interpolation)
+            # This ensures bars align perfectly with printer pixels
+            tile.paste(barcode_img, (int(barcode_img_x), int(barcode_start_y)))
+            actual_barcode_height = barcode_img_height
+
+            if debug:
+                print(f"    Barcode placed at ({int(barcode_img_x)}, {int(barcode_start_y)}) in label, size={barcode_img_width}x{barcode_img_height}px")
+                print(f"    Quiet zone: {QUIET_ZONE_MM}mm ({QUIET_ZONE_PX}px) on each side")
+
+        except Exception as e:
+            if debug:
+                print(f"⚠️  Failed to generate real barcode for '{barcode_value}', using pattern: {e}")
+            # Fallback to pattern-based barcode
+            raise RuntimeError(f"Failed to generate barcode: {e}")
+    else:
+        # Library not available? This should not happen if we check earlier.
+        raise ImportError("python-barcode library not available. Please install it.")
+
+    # Draw barcode number directly below barcode lines (minimal gap - 2px)
+    barcode_text = barcode_value[:16] if len(barcode_value) > 16 else barcode_value
+    gap = 2
+    barcode_text_y = barcode_start_y + max(0, int(actual_barcode_height)) + gap
+
+    draw.text(
+        (label_center_x, barcode_text_y),
+        barcode_text,
+        fill=0,
+        font=fonts["barcode"],
+        anchor="ma",
+    )
+    return tile
+
 
 def render_barcode_labels(
     products: List[Dict],
@@ -202,6 +342,7 @@ def render_barcode_labels(
     business_name: Optional[str] = None,
     out_dir: str = ".",
     debug: bool = False,
+    raw_output: bool = False,
 ) -> str:
     """
     Render barcode labels for multiple products.
@@ -215,9 +356,10 @@ def render_barcode_labels(
         business_name: Business name to display on each label
         out_dir: Directory to save the image
         debug: Print debug info
+        raw_output: Write a 1-bit P4 PBM instead of a PNG (no deflate step)
     
     Returns:
-        Path to generated PNG image
+        Path to generated PNG (or PBM) image
     """
     if debug:
         print("\n" + "="*60)
@@ -236,12 +378,24 @@ def render_barcode_labels(
         print(f"Products: {len(products)}")
         print(f"Quantities: {sum(quantities.values())} total labels")
     
-    # Build flat list of all labels to print (in order) - NO DUPLICATION
-    # Each product appears exactly 'quantity' times, sequentially
-    label_list = []
-    for product in products:
-        product_id = product.get("id")
-        if product_id not in quantities or quantities[product_id] <= 0:
+    # Trim the business line once; it is the same on every label
+    business_text = None
+    if business_name:
+        business_text = business_name[:25] + "..." if len(business_name) > 25 else business_name
+
+    # Name the file from everything that ends up on the media, so a re-print
+    # of the same labels finds the finished PNG and skips rendering
+    h = hashlib.blake2b(digest_size=8)
+    h.update(f"{business_text}|{debug};".encode())
+
+    # Build the print plan: (product, quantity) in the order of `quantities`.
+    # Walk the (small) quantities dict and look products up, rather than
+    # scanning the whole product list for the few being printed
+    products_by_id = {product.get("id"): product for product in products}
+    plan = []
+    for product_id, qty in quantities.items():
+        product = products_by_id.get(product_id)
+        if product is None or qty <= 0:
             continue
         
         barcode_value = product.get("barcode", "")
@@ -250,17 +404,24 @@ def render_barcode_labels(
                 print(f"⚠️  Skipping product {product_id} (no barcode)")
             continue
         
-        qty = quantities[product_id]
-        # Add each label instance to the flat list - each prints ONCE
-        for _ in range(qty):
-            label_list.append(product)
+        h.update(
+            f"{product_id}|{barcode_value}|{product.get('name', '')}|{_get_price_text(product)}|{qty};".encode()
+        )
+        plan.append((product, qty))
     
-    if not label_list:
+    if not plan:
         raise ValueError("No labels to generate")
+
+    out_dir = Path(out_dir)
+    out_path = out_dir / f"barcode_labels_{h.hexdigest()}.{'pbm' if raw_output else 'png'}"
+    if out_path.exists():
+        if debug:
+            print(f"\n✓ Barcode labels already rendered: {out_path}")
+        return str(out_path.resolve())
     
     # Calculate total rows needed
     # Each row has exactly 2 labels (2 columns)
-    total_labels = len(label_list)
+    total_labels = sum(qty for _, qty in plan)
     rows_needed = (total_labels + BARCODES_PER_ROW - 1) // BARCODES_PER_ROW
     
     # Calculate image dimensions
@@ -278,17 +439,46 @@ def render_barcode_labels(
         print(f"  Labels per row: {BARCODES_PER_ROW} (2 columns)")
     
     # Create image at 203 DPI
-    img = Image.new("RGB", (img_width, img_height), color=(255, 255, 255))
+    # Thermal media is monochrome: an 8-bit grayscale canvas is a third of
+    # the size of RGB for every paste and for the PNG encoder
+    img = Image.new("L", (img_width, img_height), color=255)
     
     # Set DPI metadata
     img.info['dpi'] = (DPI, DPI)
     
-    draw = ImageDraw.Draw(img)
+    fonts = _label_fonts()
+
+    if debug:
+        print(f"\nRendering labels (sequential placement):")
+    
+    # Place each label in sequence (left to right, top to bottom)
+    # CRITICAL: Each label prints ONCE, positioned sequentially
+    # Row 0: Label 0 (left), Label 1 (right)
+    # Row 1: Label 2 (left), Label 3 (right)
+    # Row 2: Label 4 (left), Label 5 (right)
+    # etc.
+    label_idx = 0
+    for product, qty in plan:
+        # One finished label per product; its copies are pastes of it
+        tile = _build_single_label(product, business_text, fonts, debug=debug)
+        for _ in range(qty):
+            # Row / column (0-based), then the precomputed label origin
+            # Vertical gap is REQUIRED between rows for gap sensor
+            row, col = divmod(label_idx, BARCODES_PER_ROW)
+            x = COLUMN_X_PX[col]
+            y = row * ROW_PITCH_PX
+            
+            if debug and (label_idx < 10 or label_idx % 10 == 0):
+                print(f"  Label {label_idx}: row={row}, col={col}, pos=({x:.1f}, {y:.1f})")
+
+            img.paste(tile, (x, y))
+            label_idx += 1
 
     # Optional visual guides to validate that the image "knows" it is 2-up media.
     # These guides are intentionally subtle and only drawn in debug mode.
     if debug:
-        guide = (220, 220, 220)
+        draw = ImageDraw.Draw(img)
+        guide = 220
         # Media edges
         draw.line([(0, 0), (0, img_height - 1)], fill=guide, width=1)
         draw.line([(img_width - 1, 0), (img_width - 1, img_height - 1)], fill=guide, width=1)
@@ -300,190 +490,24 @@ def render_barcode_labels(
         for xx in (x0, x1, x2, x3):
             draw.line([(int(xx), 0), (int(xx), img_height - 1)], fill=guide, width=1)
     
-    # Try to load fonts (fallback to default if not available)
-    try:
-        font_tiny = ImageFont.truetype("arial.ttf", int(8 * DPI / 96))
-        font_small = ImageFont.truetype("arial.ttf", int(9 * DPI / 96))
-        font_medium = ImageFont.truetype("arial.ttf", int(10 * DPI / 96))
-        font_barcode = ImageFont.truetype("arial.ttf", int(8 * DPI / 96))
-    except:
-        # Fallback - scale default font
-        font_tiny = ImageFont.load_default()
-        font_small = ImageFont.load_default()
-        font_medium = ImageFont.load_default()
-        font_barcode = ImageFont.load_default()
-    
-    if debug:
-        print(f"\nRendering labels (sequential placement):")
-    
-    # Render each label in sequence (left to right, top to bottom)
-    # CRITICAL: Each label prints ONCE, positioned sequentially
-    # Row 0: Label 0 (left), Label 1 (right)
-    # Row 1: Label 2 (left), Label 3 (right)
-    # Row 2: Label 4 (left), Label 5 (right)
-    # etc.
-    for label_idx, product in enumerate(label_list):
-        # Calculate row and column (0-based)
-        # Row = label index divided by labels per row (2)
-        # Column = label index modulo labels per row (0 or 1)
-        row = label_idx // BARCODES_PER_ROW
-        col = label_idx % BARCODES_PER_ROW
-        
-        # Calculate position
-        # X: Start from side margin + (column * (label_width + horizontal_gap))
-        x = START_X_PX + (col * (LABEL_WIDTH_PX + HORIZONTAL_GAP_PX))
-        # Y: (row * (label_height + vertical_gap))
-        # Vertical gap is REQUIRED between rows for gap sensor
-        y = row * (LABEL_HEIGHT_PX + VERTICAL_GAP_PX)
-        
-        if debug and (label_idx < 10 or label_idx % 10 == 0):
-            print(f"  Label {label_idx}: row={row}, col={col}, pos=({x:.1f}, {y:.1f})")
-        
-        product_name = product.get("name", "")
-        barcode_value = product.get("barcode", "")
-        
-        # Draw label content
-        current_y = y + LABEL_PADDING_PX
-        label_center_x = x + (LABEL_WIDTH_PX / 2)
-        label_width_usable = LABEL_WIDTH_PX - (LABEL_PADDING_PX * 2)
-        
-        # 1. Draw Business Name (top, center-aligned)
-        if business_name:
-            business_text = business_name[:25] + "..." if len(business_name) > 25 else business_name
-            text_width = draw.textlength(business_text, font=font_tiny)
-            text_x = label_center_x - (text_width / 2)
-            draw.text(
-                (text_x, current_y),
-                business_text,
-                fill=(0, 0, 0),
-                font=font_tiny
-            )
-            current_y += int(10 * DPI / 96)  # Scaled spacing
-        
-        # 2. Draw Product Name (middle, center-aligned)
-        product_lines = _wrap_text(draw, product_name, font_medium, label_width_usable, max_lines=2)
-        if not product_lines:
-            product_lines = [product_name[:18] + "..." if len(product_name) > 18 else product_name]
-        
-        line_height = int(12 * DPI / 96)
-        for idx, line in enumerate(product_lines[:2]):
-            text_width = draw.textlength(line, font=font_medium)
-            text_x = label_center_x - (text_width / 2)
-            draw.text(
-                (text_x, current_y + (idx * line_height)),
-                line,
-                fill=(0, 0, 0),
-                font=font_medium
-            )
-        
-        current_y += len(product_lines) * line_height + int(3 * DPI / 96)
-
-        # 2.5 Draw Price (optional, center-aligned)
-        price_text = _get_price_text(product)
-        if price_text:
-            text_width = draw.textlength(price_text, font=font_small)
-            text_x = label_center_x - (text_width / 2)
-            draw.text(
-                (text_x, current_y),
-                price_text,
-                fill=(0, 0, 0),
-                font=font_small,
-            )
-            current_y += int(10 * DPI / 96)  # Scaled spacing
-        
-        # 3. Draw Barcode (bottom, with quiet zones, center-aligned)
-        # CRITICAL: Quiet zones must be at least 2mm on left and right for scanning
-        # For Code128, quiet zone should be 10x the X-dimension minimum
-        # With X-dimension of 0.38mm, quiet zone should be ~3.8mm, but we use 2mm minimum
-        label_bottom = y + LABEL_HEIGHT_PX
-        available_height = label_bottom - current_y - LABEL_PADDING_PX
-        
-        barcode_start_y = current_y
-        
-        # Calculate barcode area with proper quiet zones
-        # Usable width = label width - (2 * padding) - (2 * quiet zone)
-        # This ensures at least 2mm white space on each side of the barcode
-        # Quiet zone is critical for scanner to detect start/stop patterns
-        barcode_width_usable = LABEL_WIDTH_PX - (LABEL_PADDING_PX * 2) - (QUIET_ZONE_PX * 2)
-        
-        # Ensure minimum usable width (at least 20mm for barcode)
-        min_barcode_width_px = _mm_to_px(20.0)
-        if barcode_width_usable < min_barcode_width_px:
-            # Reduce padding if needed to ensure minimum barcode width
-            barcode_width_usable = LABEL_WIDTH_PX - (QUIET_ZONE_PX * 2)
-            barcode_area_left = x + QUIET_ZONE_PX
-        else:
-            # Center the barcode area horizontally within the label
-            # Left edge of barcode area = label left + padding + quiet zone
-            barcode_area_left = x + LABEL_PADDING_PX + QUIET_ZONE_PX
-        
-        barcode_area_right = barcode_area_left + barcode_width_usable
-        
-        # Use actual barcode library if available for scannable barcodes
-        actual_barcode_height = 0
-        if BARCODE_LIB_AVAILABLE:
-            try:
-                # Generate Code128 that FITS without resizing (future-proof scanning)
-                barcode_img = _render_code128_fitted(
-                    barcode_value=barcode_value,
-                    barcode_width_usable_px=int(barcode_width_usable),
-                    available_height_px=int(available_height),
-                    debug=debug,
-                )
-                if barcode_img is None:
-                    raise RuntimeError("Barcode render returned None")
-
-                barcode_img_width, barcode_img_height = barcode_img.size
-
-                # Center the barcode horizontally within the barcode area
-                barcode_img_x = barcode_area_left + ((barcode_width_usable - barcode_img_width) // 2)
-                
-                # CRITICAL: Paste barcode using exact pixel coordinates (no interpolation)
-                # Use Image.NEAREST resampling to preserve exact bar widths for scanning
-                # This ensures bars align perfectly with printer pixels
-                img.paste(barcode_img, (int(barcode_img_x), int(barcode_start_y)))
-                actual_barcode_height = barcode_img_height
-                
-                if debug:
-                    print(f"    Barcode placed at ({int(barcode_img_x)}, {int(barcode_start_y)}), size={barcode_img_width}x{barcode_img_height}px")
-                    print(f"    Quiet zone: {QUIET_ZONE_MM}mm ({QUIET_ZONE_PX}px) on each side")
-                
-            except Exception as e:
-                if debug:
-                    print(f"⚠️  Failed to generate real barcode for '{barcode_value}', using pattern: {e}")
-                # Fallback to pattern-based barcode
-                raise RuntimeError(f"Failed to generate barcode: {e}")
-        else:
-            # Library not available? This should not happen if we check earlier.
-            raise ImportError("python-barcode library not available. Please install it.")
-        
-        # Draw barcode number directly below barcode lines (minimal gap - 2px)
-        barcode_text = barcode_value[:16] if len(barcode_value) > 16 else barcode_value
-        text_width = draw.textlength(barcode_text, font=font_barcode)
-        text_x = label_center_x - (text_width / 2)
-        
-        # Position text directly below barcode with minimal gap (2px)
-        gap = 2
-        barcode_text_y = barcode_start_y + max(0, int(actual_barcode_height)) + gap
-            
-        draw.text(
-            (text_x, barcode_text_y),
-            barcode_text,
-            fill=(0, 0, 0),
-            font=font_barcode
-        )
-    
     # Save image with 300 DPI
-    out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    import hashlib
-    hash_str = hashlib.md5(str(products).encode()).hexdigest()[:8]
-    out_path = out_dir / f"barcode_labels_{hash_str}.png"
     
-    # Save with DPI info and high quality settings
-    # CRITICAL: Use PNG format with no compression to preserve exact pixel values
-    # This ensures barcode bars are rendered exactly as intended for scanning
-    img.save(out_path, dpi=(DPI, DPI), format='PNG', compress_level=0)
+    # Save with DPI info
+    # PNG is lossless at any compression level, so bars keep their exact pixel
+    # widths; level 1 is nearly as fast as 0 and far smaller on disk.
+    # Written under a temp name unique to this process and thread (runserver
+    # is threaded; a double-clicked Print renders the same sheet twice) and
+    # swapped in, so a concurrent re-print never picks up a half-written file
+    # as already rendered
+    tmp_path = out_path.with_name(f"{out_path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+    if raw_output:
+        # P4 PBM: packed 1-bit rows behind a short header, nothing to compress.
+        # Threshold rather than dither so bar edges stay sharp
+        img.convert("1", dither=Image.Dither.NONE).save(tmp_path, format='PPM')
+    else:
+        img.save(tmp_path, dpi=(DPI, DPI), format='PNG', compress_level=1)
+    os.replace(tmp_path, out_path)
     
     if debug:
         print(f"\n✓ Barcode labels saved: {out_path}")
@@ -497,15 +521,27 @@ def render_barcode_labels(
     return str(out_path.resolve())
 
 
-def _wrap_text(draw, text, font, max_width, max_lines=2):
+@lru_cache(maxsize=4096)
+def _word_width(font, word):
+    """Width of `word` plus its trailing space; product names repeat words a lot."""
+    return font.getlength(word + " ")
+
+
+def _wrap_text(text, font, max_width, max_lines=2):
     """Wrap text to fit within max_width."""
     words = text.split()
+    # Short names (the common case) fit on one line as-is
+    if words:
+        one_line = " ".join(words)
+        if font.getlength(one_line + " ") <= max_width:
+            return [one_line]
+
     lines = []
     current_line = []
     current_width = 0
     
     for word in words:
-        word_width = draw.textlength(word + " ", font=font)
+        word_width = _word_width(font, word)
         if current_width + word_width <= max_width:
             current_line.append(word)
             current_width += word_width
@@ -1,9 +1,13 @@
 from __future__ import annotations
+from bisect import bisect_right
+from itertools import accumulate
 from pathlib import Path
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
 from typing import Iterable, List, Optional, Tuple
+import logging
 import os
-import sys
+import re
 from datetime import datetime, timedelta
 
 
@@ -11,18 +15,18 @@ from PIL import Image, ImageDraw, ImageFont
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
+logger = logging.getLogger(__name__)
+
 # Optional RTL (Urdu, Arabic) shaping support
 try:
     import arabic_reshaper
     from bidi.algorithm import get_display
     _HAS_RTL = True
-    print("[OK] RTL libraries (arabic_reshaper, bidi) imported successfully")
 except ImportError as e:
     arabic_reshaper = None  # type: ignore
     get_display = None      # type: ignore
     _HAS_RTL = False
-    print(f"✗ RTL libraries not found: {e}")
-    print("  Install with: pip install python-bidi arabic-reshaper")
+    logger.warning("RTL libraries not found (%s); install python-bidi and arabic-reshaper", e)
 
 # ---- Style Configuration ----
 TITLE_SIZE = 40  # Increased for better readability
@@ -30,6 +34,17 @@ BODY_SIZE = 30   # Increased for better readability
 SMALL_SIZE = 24  # Increased for better readability
 LINE_H = int(BODY_SIZE * 1.5)
 HEADER_GAP = int(BODY_SIZE * 0.8)
+
+# Derived spacing, computed once instead of at every use
+TITLE_LINE_H = int(TITLE_SIZE * 1.4)       # centred title line
+BODY_CENTER_LINE_H = int(BODY_SIZE * 1.4)  # centred body line
+SUBTITLE_LINE_H = int(BODY_SIZE * 1.2)
+SMALL_LINE_H = int(SMALL_SIZE * 1.3)       # address/contact lines (pre-pass)
+TITLE_GAP = int(SMALL_SIZE * 0.5)          # after the title
+ADDR_GAP = int(SMALL_SIZE * 0.3)           # after subtitle/address lines
+HEADER_GAP_DRAWN = int(HEADER_GAP * 0.7)   # reduced gap under the header
+DIVIDER_GAP = int(BODY_SIZE * 0.6)         # space after a divider line
+DIVIDER_H = DIVIDER_GAP + 2 + DIVIDER_GAP  # pre-pass allowance per divider
 PAD = 20
 
 # Column ratios for item table
@@ -41,7 +56,7 @@ AMOUNT_COL_RATIO = 0.22
 COL_GAP = 8
 ROW_GAP = 8
 SEP_WIDTH = 1
-SEP_COLOR = (40, 40, 40)
+SEP_COLOR = 40  # grayscale; receipts are drawn on an "L" canvas
 
 # ---- Font Configuration ----
 URDU_FONT_REGULAR = str(getattr(settings, "RECEIPT_URDU_FONT", "") or "")
@@ -77,24 +92,19 @@ class MultiScriptFontManager:
             "DejaVuSans.ttf",
         ]
         
-        # Try to find an English font
-        self.english_font_path = None
-        for font_path in self.english_font_paths:
-            try:
-                if os.path.exists(font_path):
-                    # Test if font can be loaded
-                    test_font = ImageFont.truetype(font_path, size=12)
-                    self.english_font_path = font_path
-                    print(f"[OK] Found English font: {Path(font_path).name}")
-                    break
-            except Exception:
-                continue
-        
-        if not self.english_font_path:
-            print("⚠ No specific English font found, will use default if needed")
+        # Try to find an English font: first file that exists. A font that then
+        # fails to load falls back to the default font in _load_font.
+        self.english_font_path = next((p for p in self.english_font_paths if os.path.isfile(p)), None)
+        if self.english_font_path:
+            logger.debug("Found English font: %s", self.english_font_path)
+        else:
+            logger.warning("No specific English font found, will use default if needed")
         
         # Font cache
         self.font_cache = {}
+        # (text, size, is_bold) -> (font, is_rtl); receipts measure and then
+        # draw the same strings, and wrap/ellipsize probe many prefixes
+        self.text_font_cache = {}
     
     def _needs_urdu_font(self, text: str) -> bool:
         """Check if text needs Urdu/Arabic font."""
@@ -102,21 +112,28 @@ class MultiScriptFontManager:
     
     def _get_font_for_text(self, text: str, size: int, is_bold: bool = False) -> Tuple[ImageFont.ImageFont, bool]:
         """Return appropriate font for the text content."""
+        key = (text, size, is_bold)
+        cached = self.text_font_cache.get(key)
+        if cached is None:
+            if len(self.text_font_cache) >= 4096:
+                self.text_font_cache.clear()
+            cached = self.text_font_cache[key] = self._pick_font_for_text(text, size, is_bold)
+        return cached
+
+    def _pick_font_for_text(self, text: str, size: int, is_bold: bool) -> Tuple[ImageFont.ImageFont, bool]:
         if not text:
             # Default to Urdu font for empty text
             return self._load_font(self.urdu_font_bold if is_bold else self.urdu_font_regular, size), True
         
+        # Numbers, amounts, codes and English labels: no script scan needed
+        if self.english_font_path and text.isascii():
+            return self._load_font(self.english_font_path, size), False
+        
         # Check if text needs Urdu font
         needs_urdu = self._needs_urdu_font(text)
         
         # Check if text contains Latin characters that need proper rendering
-        has_latin = False
-        for ch in text:
-            code = ord(ch)
-            # Latin letters A-Z, a-z
-            if (0x0041 <= code <= 0x005A) or (0x0061 <= code <= 0x007A):
-                has_latin = True
-                break
+        has_latin = _LATIN_RE.search(text) is not None
         
         # Choose font strategy
         if needs_urdu:
@@ -140,27 +157,38 @@ class MultiScriptFontManager:
         if not path:
             return ImageFont.load_default()
         
-        cache_key = f"{path}_{size}"
+        cache_key = (path, size)
         
         if cache_key in self.font_cache:
             return self.font_cache[cache_key]
         
+        # Latin text needs no complex shaping, so skip Raqm for the English
+        # font even where Pillow was built with it
+        engine = ImageFont.Layout.BASIC if path == self.english_font_path else None
         try:
             if os.path.exists(path):
-                font = ImageFont.truetype(path, size=size)
+                font = ImageFont.truetype(path, size=size, layout_engine=engine)
                 self.font_cache[cache_key] = font
                 return font
             else:
                 # Try to load by filename (PIL searches system)
-                font = ImageFont.truetype(Path(path).name, size=size)
+                font = ImageFont.truetype(Path(path).name, size=size, layout_engine=engine)
                 self.font_cache[cache_key] = font
                 return font
         except Exception as e:
-            print(f"⚠ Error loading font {path}: {e}")
+            logger.warning("Error loading font %s: %s", path, e)
             font = ImageFont.load_default()
             self.font_cache[cache_key] = font
             return font
     
+    def warmup(self, sizes: Iterable[int] = ()) -> None:
+        """Load every script/weight variant of the given sizes up front."""
+        paths = {self.urdu_font_regular, self.urdu_font_bold, self.english_font_path}
+        for size in sizes:
+            for path in paths:
+                if path:
+                    self._load_font(path, size)
+
     def get_font(self, size: int, font_type: str = "regular", text: Optional[str] = None) -> Tuple[ImageFont.ImageFont, bool]:
         """Get font with intelligent script detection."""
         is_bold = font_type in ("title", "body-bold", "small-bold", "bold")
@@ -174,6 +202,7 @@ class MultiScriptFontManager:
 
 # Initialize font manager
 font_manager = MultiScriptFontManager()
+font_manager.warmup((TITLE_SIZE, BODY_SIZE, SMALL_SIZE))
 
 
 def _test_urdu_rendering(font_path: str) -> bool:
@@ -195,13 +224,13 @@ def _test_urdu_rendering(font_path: str) -> bool:
         
         # If width is too small or zero, font can't render Urdu
         if width < 5:
-            print(f"✗ Font cannot render Urdu properly (width: {width}px)")
+            logger.warning("Font cannot render Urdu properly (width: %spx)", width)
             return False
         
-        print(f"[OK] Font can render Urdu (test width: {width}px)")
+        logger.debug("Font can render Urdu (test width: %spx)", width)
         return True
     except Exception as e:
-        print(f"✗ Error testing font: {e}")
+        logger.warning("Error testing font %s: %s", font_path, e)
         return False
 
 
@@ -211,39 +240,36 @@ def _load_font(path: str, size: int, font_type: str = "regular") -> ImageFont.Im
     Falls back to a working font if the specified one fails.
     """
     if not path:
-        print(f"WARNING: No font path specified for {font_type} size {size}", file=sys.stderr)
+        logger.warning("No font path specified for %s size %s", font_type, size)
         return ImageFont.load_default()
     
     if not os.path.exists(path):
-        print(f"ERROR: Font file not found: {path}", file=sys.stderr)
-        print(f"Please ensure the Urdu font is installed at: {path}", file=sys.stderr)
+        logger.error("Font file not found: %s (install the Urdu font there)", path)
         return ImageFont.load_default()
     
     try:
         font = ImageFont.truetype(path, size=size)
-        print(f"[OK] Loaded {font_type} font: {Path(path).name} (size {size})")
+        logger.debug("Loaded %s font: %s (size %s)", font_type, Path(path).name, size)
         return font
     except Exception as e:
-        print(f"ERROR loading font {path}: {e}", file=sys.stderr)
+        logger.error("Error loading font %s: %s", path, e)
         return ImageFont.load_default()
 
 
 # Initialize fonts with logging
-print("\n" + "="*60)
-print("INITIALIZING RECEIPT FONTS")
-print("="*60)
-print(f"Regular font path: {URDU_FONT_REGULAR}")
-print(f"Bold font path: {URDU_FONT_BOLD}")
-print(f"RTL Support available: {_HAS_RTL}")
-print("-"*60)
+logger.debug(
+    "Initializing receipt fonts: regular=%s bold=%s rtl=%s",
+    URDU_FONT_REGULAR, URDU_FONT_BOLD, _HAS_RTL,
+)
 
 # Test if font can render Urdu
 if URDU_FONT_REGULAR:
-    print("Testing Urdu rendering capability...")
     can_render = _test_urdu_rendering(URDU_FONT_REGULAR)
     if not can_render:
-        print("⚠ WARNING: Font loaded but may not render Urdu correctly!")
-        print("  Consider using: Jameel Noori Nastaleeq or Alvi Nastaleeq")
+        logger.warning(
+            "Font %s may not render Urdu correctly; consider Jameel Noori Nastaleeq or Alvi Nastaleeq",
+            URDU_FONT_REGULAR,
+        )
 
 # Create basic font objects for compatibility (These will be used as references only)
 FONT_TITLE = _load_font(URDU_FONT_BOLD or URDU_FONT_REGULAR, TITLE_SIZE, "title")
@@ -251,26 +277,29 @@ FONT_BODY = _load_font(URDU_FONT_REGULAR, BODY_SIZE, "body")
 FONT_SMALL = _load_font(URDU_FONT_REGULAR, SMALL_SIZE, "small")
 FONT_BODY_BOLD = _load_font(URDU_FONT_BOLD or URDU_FONT_REGULAR, BODY_SIZE, "body-bold")
 FONT_SMALL_BOLD = _load_font(URDU_FONT_BOLD or URDU_FONT_REGULAR, SMALL_SIZE, "small-bold")
-
-print("="*60 + "\n")
+_BOLD_FONTS = (FONT_TITLE, FONT_BODY_BOLD, FONT_SMALL_BOLD)
 
 
 # ---- RTL Text Handling ----
+_RTL_RE = re.compile(
+    "["
+    "\u0600-\u06FF"  # Arabic
+    "\u0750-\u077F"  # Arabic Supplement
+    "\u08A0-\u08FF"  # Arabic Extended-A
+    "\uFB50-\uFDFF"  # Arabic Presentation Forms-A
+    "\uFE70-\uFEFF"  # Arabic Presentation Forms-B
+    "]"
+)
+_LATIN_RE = re.compile("[A-Za-z]")
+
+
+@lru_cache(maxsize=4096)
 def _needs_rtl_shaping(text: str) -> bool:
     """Detect if text contains Arabic or Urdu characters."""
-    if not text:
+    # Most receipt text (numbers, codes, English labels) is plain ASCII
+    if not text or text.isascii():
         return False
-    for ch in text:
-        code = ord(ch)
-        if (
-            0x0600 <= code <= 0x06FF or  # Arabic
-            0x0750 <= code <= 0x077F or  # Arabic Supplement
-            0x08A0 <= code <= 0x08FF or  # Arabic Extended-A
-            0xFB50 <= code <= 0xFDFF or  # Arabic Presentation Forms-A
-            0xFE70 <= code <= 0xFEFF     # Arabic Presentation Forms-B
-        ):
-            return True
-    return False
+    return _RTL_RE.search(text) is not None
 
 
 def _shape_text(text: str, debug: bool = False) -> str:
@@ -280,6 +309,8 @@ def _shape_text(text: str, debug: bool = False) -> str:
     """
     if not text:
         return ""
+    if text.isascii():
+        return text
     
     has_urdu = _needs_rtl_shaping(text)
     
@@ -290,36 +321,40 @@ def _shape_text(text: str, debug: bool = False) -> str:
     
     if not _HAS_RTL:
         if has_urdu:
-            print(f"⚠ WARNING: Urdu text detected but RTL libraries not installed!")
-            print(f"  Text: {text[:50]}")
-            print(f"  Install: pip install python-bidi arabic-reshaper")
+            logger.warning("Urdu text detected but RTL libraries not installed: %s", text[:50])
         return text
     
     if not has_urdu:
         return text
     
+    result = _shape_cached(text)
+    if debug:
+        print(f"  Reshaped: {result[:50]}")
+    return result
+
+
+@lru_cache(maxsize=2048)
+def _shape_cached(text: str) -> str:
+    """Reshape + bidi-reorder once per distinct string."""
     try:
-        reshaped = arabic_reshaper.reshape(text)
-        result = get_display(reshaped)
-        
-        if debug:
-            print(f"  Reshaped: {result[:50]}")
-        
-        return result
+        return get_display(arabic_reshaper.reshape(text))
     except Exception as e:
-        print(f"✗ Error shaping text: {e}", file=sys.stderr)
-        print(f"  Text was: {text[:50]}")
+        logger.error("Error shaping text %r: %s", text[:50], e)
         return text
 
 
 # ---- Helper Functions ----
+_CENT = Decimal("0.01")
+_HUNDRED = Decimal("100")
+
+
 def _money(v) -> str:
     """Format number as money with proper decimals."""
     try:
-        q = Decimal(v).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        q = Decimal(v).quantize(_CENT, rounding=ROUND_HALF_UP)
     except Exception:
         try:
-            q = Decimal(str(v)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            q = Decimal(str(v)).quantize(_CENT, rounding=ROUND_HALF_UP)
         except Exception:
             return str(v)
     s = f"{q:,.2f}"
@@ -331,13 +366,13 @@ def _money(v) -> str:
 def _qty2(v) -> str:
     """Format quantity with up to 2 decimal places."""
     try:
-        q = Decimal(v).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        q = Decimal(v).quantize(_CENT, rounding=ROUND_HALF_UP)
     except Exception:
         try:
-            q = Decimal(str(v)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            q = Decimal(str(v)).quantize(_CENT, rounding=ROUND_HALF_UP)
         except Exception:
             try:
-                q = Decimal(str(float(v))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+                q = Decimal(str(float(v))).quantize(_CENT, rounding=ROUND_HALF_UP)
             except Exception:
                 return str(v)
     
@@ -347,21 +382,68 @@ def _qty2(v) -> str:
     return s
 
 
-def _text_w(draw: ImageDraw.ImageDraw, txt: str, font: ImageFont.ImageFont) -> int:
-    """Calculate text width with proper font selection."""
-    # Get appropriate font for this text
+def _receipt_titles(business, doc) -> Tuple[str, Optional[str]]:
+    """
+    Header names: (title, subtitle). The title is the business name from the
+    creating user's settings (first/consistent name) and the subtitle the
+    Business model name (second name that changes per business).
+    """
+    title = None
+    user = getattr(doc, "created_by", None) or getattr(doc, "updated_by", None)
+    if user:
+        try:
+            user_settings = getattr(user, "settings", None)
+            if user_settings and user_settings.business_name and user_settings.business_name.strip():
+                title = user_settings.business_name.strip()
+        except Exception:
+            pass
+    
+    subtitle = (
+        getattr(business, "legal_name", None)
+        or getattr(business, "name", None)
+        or ""
+    ).strip()
+    
+    # Fallback: if no UserSettings name, use business name as title
+    if not title:
+        return subtitle or "Business", None  # Don't show duplicate
+    return title, subtitle
+
+
+def _smart_font(txt: str, font: ImageFont.ImageFont) -> Tuple[ImageFont.ImageFont, bool, bool]:
+    """Resolve the font actually used for `txt` at `font`'s size/weight: (font, is_rtl, is_bold)."""
+    # Get font size
     try:
         size = font.size
     except AttributeError:
         size = BODY_SIZE
     
-    # Determine if bold
-    is_bold = False
-    font_str = str(font).lower()
-    if "bold" in font_str or font == FONT_TITLE or font == FONT_BODY_BOLD or font == FONT_SMALL_BOLD:
-        is_bold = True
+    # Bold is decided by which module font the caller passed
+    is_bold = font in _BOLD_FONTS
     
     smart_font, is_rtl = font_manager._get_font_for_text(txt, size, is_bold)
+    return smart_font, is_rtl, is_bold
+
+
+@lru_cache(maxsize=4096)
+def _char_advance(font: ImageFont.ImageFont, ch: str) -> float:
+    """Advance width of one character; LTR prefix widths are sums of these."""
+    try:
+        return font.getlength(ch)
+    except Exception:
+        return 10.0
+
+
+_measure_cache: dict = {}
+
+
+def _text_w(draw: Optional[ImageDraw.ImageDraw], txt: str, font: ImageFont.ImageFont) -> int:
+    """
+    Calculate text width with proper font selection.
+    Measures through the font itself, so `draw` may be None (height pre-pass).
+    """
+    # Get appropriate font for this text
+    smart_font, is_rtl, _ = _smart_font(txt, font)
     
     # Shape text if it's RTL
     if is_rtl:
@@ -369,35 +451,34 @@ def _text_w(draw: ImageDraw.ImageDraw, txt: str, font: ImageFont.ImageFont) -> i
     else:
         shaped = txt
     
+    # Headers, column labels, unit codes and wrap/ellipsize probes repeat the
+    # same strings; measure each (font, text) pair once
+    key = (smart_font, shaped)
+    w = _measure_cache.get(key)
+    if w is not None:
+        return w
+    
     try:
-        bbox = draw.textbbox((0, 0), shaped, font=smart_font)
-        return int(bbox[2] - bbox[0])
+        bbox = smart_font.getbbox(shaped)
+        w = int(bbox[2] - bbox[0])
     except Exception:
         try:
-            return int(draw.textlength(shaped, font=smart_font))
+            w = int(smart_font.getlength(shaped))
         except Exception:
             return len(txt) * 10  # Fallback estimation
+    if len(_measure_cache) >= 8192:
+        _measure_cache.clear()
+    _measure_cache[key] = w
+    return w
 
 
-def _draw_text(draw: ImageDraw.ImageDraw, xy, txt: str, font: ImageFont.ImageFont, fill="black", debug: bool = False):
+def _draw_text(draw: ImageDraw.ImageDraw, xy, txt: str, font: ImageFont.ImageFont, fill=0, debug: bool = False):
     """Draw text with smart font selection based on content."""
     if not txt:
         return
     
-    # Get font size
-    try:
-        size = font.size
-    except AttributeError:
-        size = BODY_SIZE
-    
-    # Determine if this should be bold based on font
-    is_bold = False
-    font_str = str(font).lower()
-    if "bold" in font_str or font == FONT_TITLE or font == FONT_BODY_BOLD or font == FONT_SMALL_BOLD:
-        is_bold = True
-    
     # Get appropriate font for this text
-    smart_font, is_rtl = font_manager._get_font_for_text(txt, size, is_bold)
+    smart_font, is_rtl, is_bold = _smart_font(txt, font)
     
     # Shape text if it's RTL
     if is_rtl:
@@ -414,48 +495,139 @@ def _draw_text(draw: ImageDraw.ImageDraw, xy, txt: str, font: ImageFont.ImageFon
     try:
         draw.text(xy, shaped, fill=fill, font=smart_font)
     except Exception as e:
-        print(f"✗ Error drawing text '{txt[:20]}...': {e}")
+        logger.error("Error drawing text %r: %s", txt[:20], e)
         # Fallback to default font
         fallback_font = ImageFont.load_default()
         draw.text(xy, txt, fill=fill, font=fallback_font)
 
 
 
-def _wrap(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_w: int) -> List[str]:
+def _wrap(draw: Optional[ImageDraw.ImageDraw], text: str, font: ImageFont.ImageFont, max_w: int) -> List[str]:
     """Wrap text to fit within max_w pixels."""
-    words = (text or "").split()
+    # The height pre-pass and the draw pass wrap the same strings
+    return list(_wrap_cached(text or "", font, max_w))
+
+
+@lru_cache(maxsize=1024)
+def _wrap_cached(text: str, font: ImageFont.ImageFont, max_w: int) -> Tuple[str, ...]:
+    words = text.split()
     if not words:
-        return [""]
-    
+        return ("",)
+    if _needs_rtl_shaping(text):
+        return _wrap_shaped(words, font, max_w)
+    
+    # LTR widths add up, so measure each word once and keep a running line
+    # width
+    space_w = _text_w(None, " ", font)
+    char_w = {}
     lines: List[str] = []
     cur: List[str] = []
+    cur_w = 0
     
     for w in words:
-        trial = (" ".join(cur + [w])).strip()
-        if _text_w(draw, trial, font) <= max_w:
+        w_w = _text_w(None, w, font)
+        trial_w = cur_w + space_w + w_w if cur else w_w
+        if trial_w <= max_w:
             cur.append(w)
+            cur_w = trial_w
         else:
             if cur:
                 lines.append(" ".join(cur))
                 cur = [w]
+                cur_w = w_w
             else:
                 # Word too long, break it
                 buf = ""
+                buf_w = 0
                 for ch in w:
-                    trial_ch = buf + ch
-                    if _text_w(draw, trial_ch, font) <= max_w:
-                        buf = trial_ch
+                    ch_w = char_w.get(ch)
+                    if ch_w is None:
+                        ch_w = char_w[ch] = _text_w(None, ch, font)
+                    trial_ch_w = buf_w + ch_w
+                    if trial_ch_w <= max_w:
+                        buf += ch
+                        buf_w = trial_ch_w
                     else:
                         if buf:
                             lines.append(buf)
                         buf = ch
+                        buf_w = ch_w
                 if buf:
                     cur = [buf]
+                    cur_w = buf_w
     
     if cur:
         lines.append(" ".join(cur))
     
-    return lines
+    return tuple(lines)
+
+
+def _wrap_shaped(words: List[str], font: ImageFont.ImageFont, max_w: int) -> Tuple[str, ...]:
+    """
+    Greedy wrap for text that needs RTL shaping. Shaped letters join across
+    word boundaries and the line is reordered as a whole, so widths don't add
+    up; instead each line's word count is found by binary search over
+    measured trial lines (the whole remainder is tried first, so text that
+    fits costs a single measurement).
+    """
+    def fits(parts: List[str]) -> bool:
+        return _text_w(None, " ".join(parts), font) <= max_w
+    
+    lines: List[str] = []
+    n = len(words)
+    if fits(words[:1]):
+        cur, i = words[:1], 1
+    else:
+        pieces = _split_word(None, words[0], font, max_w)
+        lines.extend(pieces[:-1])
+        cur, i = pieces[-1:], 1
+    
+    while i < n:
+        # Largest k such that cur + words[i:i + k] still fits
+        if fits(cur + words[i:]):
+            k = n - i
+        else:
+            lo, hi = 0, n - i - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if fits(cur + words[i:i + mid]):
+                    lo = mid
+                else:
+                    hi = mid - 1
+            k = lo
+        cur = cur + words[i:i + k]
+        i += k
+        if i < n:
+            # Like the LTR loop, the word that overflowed starts the next
+            # line as-is
+            lines.append(" ".join(cur))
+            cur, i = [words[i]], i + 1
+    
+    lines.append(" ".join(cur))
+    return tuple(lines)
+
+
+def _split_word(draw: Optional[ImageDraw.ImageDraw], word: str, font: ImageFont.ImageFont, max_w: int) -> List[str]:
+    """
+    Break a word wider than max_w into pieces that fit (shaped text).
+    Jumps ahead by an estimated piece length, then grows or shrinks it one
+    character at a time, so each piece costs a few measurements rather than
+    one per character.
+    """
+    # The whole word was just measured by the caller, so this is a cache hit
+    avg_w = max(_text_w(draw, word, font) / len(word), 1)
+    estimate = max(int(max_w // avg_w), 1)
+    pieces: List[str] = []
+    i, n = 0, len(word)
+    while i < n:
+        j = min(n, i + estimate)
+        while j < n and _text_w(draw, word[i:j + 1], font) <= max_w:
+            j += 1
+        while j > i + 1 and _text_w(draw, word[i:j], font) > max_w:
+            j -= 1
+        pieces.append(word[i:j])
+        i = j
+    return pieces
 
 
 def _ellipsize(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_w: int) -> str:
@@ -464,16 +636,31 @@ def _ellipsize(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont,
         return text
     
     ell = "…"
-    if _text_w(draw, ell, font) > max_w:
+    ell_w = _text_w(draw, ell, font)
+    if ell_w > max_w:
         return ""
     
+    def fits(n: int) -> bool:
+        return _text_w(draw, text[:n] + ell, font) <= max_w
+    
+    if not _needs_rtl_shaping(text):
+        # LTR: guess the cut from summed character advances, then settle it
+        # with a real measurement or two instead of a full binary search
+        smart_font, _, _ = _smart_font(text, font)
+        budget = max_w - ell_w
+        n = bisect_right(list(accumulate(_char_advance(smart_font, ch) for ch in text)), budget)
+        while n < len(text) and fits(n + 1):
+            n += 1
+        while n > 0 and not fits(n):
+            n -= 1
+        return text[:n] + ell
+    
     lo, hi = 0, len(text)
     best = ""
     while lo <= hi:
         mid = (lo + hi) // 2
-        trial = text[:mid] + ell
-        if _text_w(draw, trial, font) <= max_w:
-            best = trial
+        if fits(mid):
+            best = text[:mid] + ell
             lo = mid + 1
         else:
             hi = mid - 1
@@ -487,10 +674,42 @@ def _draw_center(draw: ImageDraw.ImageDraw, x0: int, width: int, y: int, txt: st
     return y + int(font.size * 1.4)
 
 
+@lru_cache(maxsize=128)
+def _label_mask(txt: str, font: ImageFont.ImageFont) -> Tuple[Image.Image, int, int]:
+    """
+    Coverage mask of a fixed label, rasterized once, plus the offset of its
+    top-left corner from the text origin (glyphs can overhang to the left).
+    """
+    smart_font, is_rtl, _ = _smart_font(txt, font)
+    shaped = _shape_text(txt) if is_rtl else txt
+    bbox = smart_font.getbbox(shaped)
+    ox, oy = min(bbox[0], 0), min(bbox[1], 0)
+    mask = Image.new("L", (max(bbox[2] - ox, 1), max(bbox[3] - oy, 1)), 0)
+    ImageDraw.Draw(mask).text((-ox, -oy), shaped, fill=255, font=smart_font)
+    return mask, ox, oy
+
+
+def _draw_label(draw: ImageDraw.ImageDraw, xy, txt: str, font: ImageFont.ImageFont) -> None:
+    """
+    Draw a fixed label (column headers, row keys, footer) by stamping its
+    cached mask instead of rasterizing the glyphs again.
+    """
+    if txt:
+        mask, ox, oy = _label_mask(txt, font)
+        draw.bitmap((int(xy[0]) + ox, int(xy[1]) + oy), mask, fill=0)
+
+
+def _draw_label_center(draw: ImageDraw.ImageDraw, x0: int, width: int, y: int, txt: str, font: ImageFont.ImageFont) -> int:
+    """_draw_center for fixed labels."""
+    w = _text_w(draw, txt, font)
+    _draw_label(draw, (x0 + (width - w) // 2, y), txt, font)
+    return y + int(font.size * 1.4)
+
+
 def _draw_divider(draw: ImageDraw.ImageDraw, x: int, y: int, width: int) -> int:
     """Draw a horizontal divider line."""
     draw.line((x, y, x + width, y), fill=SEP_COLOR, width=2)
-    return y + int(BODY_SIZE * 0.6)
+    return y + DIVIDER_GAP
 
 
 def _draw_kv_row(
@@ -508,11 +727,17 @@ def _draw_kv_row(
     left_w = int(width * left_ratio)
     right_w = width - left_w
     
-    left_lines = _wrap(draw, left_txt, font, left_w - 10)
-    yy = y
-    for line in left_lines:
-        _draw_text(draw, (x, yy), line, font, debug=debug)
-        yy += LINE_H
+    # Keys ("SubTotal", "Tax (5%)", ...) almost always fit on one line
+    left_line = " ".join(left_txt.split())
+    if _text_w(draw, left_line, font) <= left_w - 10:
+        _draw_label(draw, (x, y), left_line, font)
+        yy = y + LINE_H
+    else:
+        left_lines = _wrap(draw, left_txt, font, left_w - 10)
+        yy = y
+        for line in left_lines:
+            _draw_text(draw, (x, yy), line, font, debug=debug)
+            yy += LINE_H
     
     if right_txt:
         rw = _text_w(draw, right_txt, font)
@@ -544,7 +769,29 @@ def render_receipt_bitmap(
     pad = PAD
     x0 = pad
     content_w = width_px - (pad * 2)
-    items = list(items)
+
+    # One pass over the items for everything the totals, the height pre-pass
+    # and the draw loop need: (name, qty display, amount text, amount)
+    rows = []
+    for it in items:
+        name = getattr(getattr(it, "product", None), "name", None) or getattr(it, "product_name", "Item")
+        qty = getattr(it, "quantity", 0) or 0
+        rate = getattr(it, "unit_price", 0) or 0
+        total = Decimal(str(qty)) * Decimal(str(rate))
+        
+        # Get unit information from item
+        unit_code = ""
+        if hasattr(it, "uom") and it.uom:
+            unit_code = getattr(it.uom, "code", "") or ""
+        elif hasattr(it, "product") and it.product:
+            # Fallback to product's base unit
+            product_uom = getattr(it.product, "uom", None)
+            if product_uom:
+                unit_code = getattr(product_uom, "code", "") or ""
+
+        qty_str = _qty2(qty)
+        qty_display = f"{qty_str} {unit_code}" if unit_code else qty_str
+        rows.append((str(name), qty_display, _money(total), total))
 
     # Extract order data
     # FIX: Get received amount. If the attribute is 0, check for payment applications
@@ -576,18 +823,12 @@ def render_receipt_bitmap(
         bank_label = " / ".join([b for b in label_bits if b])
 
     # Calculate totals
-    try:
-        subtotal = sum(
-            (Decimal(str(getattr(it, "quantity", 0))) * Decimal(str(getattr(it, "unit_price", 0))))
-            for it in items
-        )
-    except Exception:
-        subtotal = Decimal("0.00")
+    subtotal = sum((total for _, _, _, total in rows), Decimal("0.00"))
 
     tax_pct = Decimal(str(getattr(order, "tax_percent", 0) or 0))
     disc_pct = Decimal(str(getattr(order, "discount_percent", 0) or 0))
-    tax_amt = (subtotal * tax_pct) / Decimal("100")
-    disc_amt = (subtotal * disc_pct) / Decimal("100")
+    tax_amt = (subtotal * tax_pct) / _HUNDRED
+    disc_amt = (subtotal * disc_pct) / _HUNDRED
     net = subtotal + tax_amt - disc_amt
 
     paid_so_far = Decimal(str(getattr(order, "paid_so_far", 0) or 0))
@@ -629,6 +870,9 @@ def render_receipt_bitmap(
 
     # Get customer name with debug - FIXED: Ensure proper encoding
     customer_name = str(getattr(order, "customer_name", "") or "")
+    # Resolve the name's font and shaping once, up front
+    name_font, name_is_rtl = font_manager._get_font_for_text(customer_name, BODY_SIZE, False)
+    shaped_name = _shape_text(customer_name, debug=debug) if (customer_name and name_is_rtl) else customer_name
     if debug and customer_name:
         print(f"Customer name: '{customer_name}'")
         print(f"  Length: {len(customer_name)}")
@@ -637,50 +881,20 @@ def render_receipt_bitmap(
         for i, char in enumerate(customer_name[:20]):
             print(f"  Char {i}: '{char}' (U+{ord(char):04X})")
 
-    # Get business name from UserSettings (first/consistent name)
-    title = None
-    subtitle = None  # Business model name (second/variable name)
-    user = None
-    if hasattr(order, 'created_by') and order.created_by:
-        user = order.created_by
-    elif hasattr(order, 'updated_by') and order.updated_by:
-        user = order.updated_by
-    
-    if user:
-        try:
-            from barkat.models import UserSettings
-            user_settings = getattr(user, 'settings', None)
-            if user_settings and user_settings.business_name and user_settings.business_name.strip():
-                title = user_settings.business_name.strip()
-        except Exception:
-            pass
-    
-    # Always get business model name as subtitle (second name that changes per business)
-    subtitle = (
-        getattr(business, "legal_name", None)
-        or getattr(business, "name", None)
-        or ""
-    ).strip()
-    
-    # Fallback: if no UserSettings name, use business name as title
-    if not title:
-        title = subtitle or "Business"
-        subtitle = None  # Don't show duplicate
+    title, subtitle = _receipt_titles(business, order)
 
     # Calculate required height
-    dummy = Image.new("RGB", (width_px, 100), color=(255, 255, 255))
-    d = ImageDraw.Draw(dummy)
     y = pad
 
-    y += int(TITLE_SIZE * 1.4)
+    y += TITLE_LINE_H
     
     # Add subtitle if business name is different from title
     if subtitle and subtitle != title:
-        y += int(BODY_SIZE * 1.2)
+        y += SUBTITLE_LINE_H
     
     addr_lines = []
     if getattr(business, "address", ""):
-        addr_lines.extend(_wrap(d, str(business.address).strip(), FONT_SMALL, content_w))
+        addr_lines.extend(_wrap(None, str(business.address).strip(), FONT_SMALL, content_w))
     
     contact_line = []
     if getattr(business, "phone", ""):
@@ -691,19 +905,19 @@ def render_receipt_bitmap(
         addr_lines.append(" | ".join(contact_line))
     
     for _ in addr_lines:
-        y += int(SMALL_SIZE * 1.3)
+        y += SMALL_LINE_H
     y += HEADER_GAP
 
     y += LINE_H * 6  # Order info lines (order number, item count, date, customer, printed)
-    y += int(BODY_SIZE * 0.6) + 2 + int(BODY_SIZE * 0.6)
+    y += DIVIDER_H
     y += LINE_H  # Header
-    y += int(BODY_SIZE * 0.6) + 2 + int(BODY_SIZE * 0.6)
+    y += DIVIDER_H
 
     # Each item takes 2 rows: product name, then qty and amount
-    for _ in items:
+    for _ in rows:
         y += LINE_H * 2 + ROW_GAP + 1
 
-    y += int(BODY_SIZE * 0.6) + 2 + int(BODY_SIZE * 0.6)
+    y += DIVIDER_H
     y += LINE_H * 4
 
     if prev_balance_amount is not None and prev_balance_side:
@@ -714,30 +928,32 @@ def render_receipt_bitmap(
     if final_balance_amount is not None and final_balance_side:
         y += LINE_H
 
-    y += int(BODY_SIZE * 0.6) + 2 + int(BODY_SIZE * 0.6)
-    y += int(SMALL_SIZE * 1.3) * 2
+    y += DIVIDER_H
+    y += SMALL_LINE_H * 2
 
     total_h = y + pad
 
-    # Create actual image
-    img = Image.new("RGB", (width_px, total_h), color=(255, 255, 255))
+    # Create actual image. Thermal paper is black on white: an 8-bit
+    # grayscale canvas is a third of the bytes of RGB for every glyph blit
+    # and for the PNG encoder
+    img = Image.new("L", (width_px, total_h), color=255)
     draw = ImageDraw.Draw(img)
     y = pad
 
     # Draw header with reduced spacing
     y = _draw_center(draw, x0, content_w, y, title, FONT_TITLE)
-    y += int(SMALL_SIZE * 0.5)  # Reduced gap after title
+    y += TITLE_GAP  # Reduced gap after title
     
     # Draw subtitle (business model name) if different from title
     if subtitle and subtitle != title:
         y = _draw_center(draw, x0, content_w, y, subtitle, FONT_BODY)
-        y += int(SMALL_SIZE * 0.3)
+        y += ADDR_GAP
     
     for line in addr_lines:
         y = _draw_center(draw, x0, content_w, y, line, FONT_SMALL)
-        y += int(SMALL_SIZE * 0.3)  # Reduced line spacing
+        y += ADDR_GAP  # Reduced line spacing
     
-    y += int(HEADER_GAP * 0.7)  # Reduced header gap
+    y += HEADER_GAP_DRAWN  # Reduced header gap
 
     # Order information - Show order number on top with larger font
     order_num = getattr(order, 'id', '')
@@ -746,7 +962,7 @@ def render_receipt_bitmap(
     y += LINE_H
     
     # Show number of items
-    item_count = len(items)
+    item_count = len(rows)
     items_text = f"Items: {item_count}"
     y = _draw_center(draw, x0, content_w, y, items_text, FONT_BODY)
     y += LINE_H
@@ -765,7 +981,7 @@ def render_receipt_bitmap(
         
         # Draw the label (English) with English font
         label_font, _ = font_manager._get_font_for_text(label, BODY_SIZE, False)
-        draw.text((x0, y), label, fill="black", font=label_font)
+        draw.text((x0, y), label, fill=0, font=label_font)
         
         # Calculate position for customer name
         label_width = _text_w(draw, label, FONT_BODY)
@@ -776,24 +992,15 @@ def render_receipt_bitmap(
             print(f"  Label: '{label}' (width: {label_width})")
             print(f"  Name position: x={name_x}, y={y}")
         
-        # Use smart font selection for the name only
-        name_font, is_rtl = font_manager._get_font_for_text(customer_name, BODY_SIZE, False)
-        
-        # Shape the name if it's RTL
-        if is_rtl:
-            shaped_name = _shape_text(customer_name, debug=debug)
-        else:
-            shaped_name = customer_name
-            
         if debug:
             print(f"  Using font: {name_font}")
-            print(f"  Is RTL: {is_rtl}")
+            print(f"  Is RTL: {name_is_rtl}")
             print(f"  Shaped name: '{shaped_name[:50]}...'")
         
-        draw.text((name_x, y), shaped_name, fill="black", font=name_font)
+        draw.text((name_x, y), shaped_name, fill=0, font=name_font)
         y += LINE_H
     else:
-        _draw_text(draw, (x0, y), "Customer: ", FONT_BODY)
+        _draw_label(draw, (x0, y), "Customer: ", FONT_BODY)
         y += LINE_H
         
     _draw_text(draw, (x0, y), f"Printed: {printed_at}", FONT_BODY)
@@ -808,58 +1015,37 @@ def render_receipt_bitmap(
 
     # Table header - Description | Qty | Amount (no price)
     header_y = y
-    _draw_text(draw, (x_item + COL_GAP, header_y), "Description", FONT_BODY_BOLD)
+    _draw_label(draw, (x_item + COL_GAP, header_y), "Description", FONT_BODY_BOLD)
     
     # Center: "Qty" only
     qty_label = "Qty"
     qty_label_w = _text_w(draw, qty_label, FONT_BODY_BOLD)
     qty_label_x = x0 + (content_w - qty_label_w) // 2
-    _draw_text(draw, (qty_label_x, header_y), qty_label, FONT_BODY_BOLD)
+    _draw_label(draw, (qty_label_x, header_y), qty_label, FONT_BODY_BOLD)
     
     # Right: "Amount"
     amt_label = "Amount"
     amt_w = _text_w(draw, amt_label, FONT_BODY_BOLD)
-    _draw_text(draw, (x_end - amt_w - COL_GAP, header_y), amt_label, FONT_BODY_BOLD)
+    _draw_label(draw, (x_end - amt_w - COL_GAP, header_y), amt_label, FONT_BODY_BOLD)
 
     y += LINE_H
     y = _draw_divider(draw, x0, y, content_w)
 
     # Item rows: product name on one row (full width), Qty (center) and Amount (right) on next row
-    for it in items:
-        name = getattr(getattr(it, "product", None), "name", None) or getattr(it, "product_name", "Item")
-        qty = getattr(it, "quantity", 0) or 0
-        rate = getattr(it, "unit_price", 0) or 0
-        total = (Decimal(str(qty)) * Decimal(str(rate))) if (qty is not None and rate is not None) else Decimal("0")
-        
-        # Get unit information from item
-        unit_code = ""
-        if hasattr(it, "uom") and it.uom:
-            unit_code = getattr(it.uom, "code", "") or ""
-        elif hasattr(it, "product") and it.product:
-            # Fallback to product's base unit
-            product_uom = getattr(it.product, "uom", None)
-            if product_uom:
-                unit_code = getattr(product_uom, "code", "") or ""
-
-        qty_str = _qty2(qty)
-        total_str = _money(total)
-
+    for name, qty_display, total_str, _ in rows:
         # Row 1: Product name (full width for description)
         row_y = y
         item_max_w = content_w - COL_GAP * 2
-        item_text = _ellipsize(draw, str(name), FONT_BODY, item_max_w)
+        item_text = _ellipsize(draw, name, FONT_BODY, item_max_w)
         _draw_text(draw, (x_item + COL_GAP, row_y), item_text, FONT_BODY)
         y += LINE_H
 
         # Row 2: Qty only (with unit if any) centered under "Qty" header, Amount on right
         row_y = y
-        if unit_code:
-            qty_display = f"{qty_str} {unit_code}"
-        else:
-            qty_display = qty_str
         qp_w = _text_w(draw, qty_display, FONT_BODY)
         qp_x = x0 + (content_w - qp_w) // 2
-        _draw_text(draw, (qp_x, row_y), qty_display, FONT_BODY)
+        # A handful of quantity/unit strings repeat down the whole table
+        _draw_label(draw, (qp_x, row_y), qty_display, FONT_BODY)
         
         # Amount on right
         amt_w = _text_w(draw, total_str, FONT_BODY)
@@ -907,14 +1093,16 @@ def render_receipt_bitmap(
         )
 
     y = _draw_divider(draw, x0, y, content_w)
-    y = _draw_center(draw, x0, content_w, y, "Developed by QONKAR TECHNOLOGIES", FONT_SMALL)
-    y = _draw_center(draw, x0, content_w, y, "Contact: 03058214945  |  www.qonkar.com", FONT_SMALL)
+    y = _draw_label_center(draw, x0, content_w, y, "Developed by QONKAR TECHNOLOGIES", FONT_SMALL)
+    y = _draw_label_center(draw, x0, content_w, y, "Contact: 03058214945  |  www.qonkar.com", FONT_SMALL)
 
     # Save image
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / f"receipt_order_{getattr(order, 'id', 'X')}.png"
-    img.save(out_path)
+    # Printed straight from disk by the caller, so written synchronously;
+    # fast zlib level since the file only lives until it is printed
+    img.save(out_path, format="PNG", compress_level=1)
     
     if debug:
         print(f"[OK] Receipt saved: {out_path}")
@@ -946,43 +1134,12 @@ def render_quick_receipt_bitmap(
 
     printed_at = datetime.now().strftime("%Y-%m-%d %H:%M")
 
-    # Get business name from UserSettings (first/consistent name)
-    title = None
-    subtitle = None  # Business model name (second/variable name)
-    user = None
-    if hasattr(payment, 'created_by') and payment.created_by:
-        user = payment.created_by
-    elif hasattr(payment, 'updated_by') and payment.updated_by:
-        user = payment.updated_by
-    
-    if user:
-        try:
-            from barkat.models import UserSettings
-            user_settings = getattr(user, 'settings', None)
-            if user_settings and user_settings.business_name and user_settings.business_name.strip():
-                title = user_settings.business_name.strip()
-        except Exception:
-            pass
-    
-    # Always get business model name as subtitle (second name that changes per business)
-    subtitle = (
-        getattr(business, "legal_name", None)
-        or getattr(business, "name", None)
-        or ""
-    ).strip()
-    
-    # Fallback: if no UserSettings name, use business name as title
-    if not title:
-        title = subtitle or "Business"
-        subtitle = None  # Don't show duplicate
-
-    dummy = Image.new("RGB", (width_px, 100), color=(255, 255, 255))
-    d = ImageDraw.Draw(dummy)
+    title, subtitle = _receipt_titles(business, payment)
 
     addr_lines = []
     if getattr(business, "address", ""):
         addr_lines.extend(
-            _wrap(d, str(business.address).strip(), FONT_SMALL, content_w)
+            _wrap(None, str(business.address).strip(), FONT_SMALL, content_w)
         )
     contact_bits = []
     if getattr(business, "phone", ""):
@@ -1057,25 +1214,25 @@ def render_quick_receipt_bitmap(
 
     received_text = _money(received_now)
 
-    label_w = _text_w(d, "Reference: ", FONT_BODY)
+    label_w = _text_w(None, "Reference: ", FONT_BODY)
     value_w = max(content_w - int(label_w) - 8, 40)
 
-    party_lines = _wrap(d, party_name, FONT_BODY, value_w) if party_name else [""]
-    ref_lines = _wrap(d, ref_no, FONT_BODY, value_w) if ref_no else []
-    note_lines = _wrap(d, note, FONT_BODY, value_w) if note else []
+    party_lines = _wrap(None, party_name, FONT_BODY, value_w) if party_name else [""]
+    ref_lines = _wrap(None, ref_no, FONT_BODY, value_w) if ref_no else []
+    note_lines = _wrap(None, note, FONT_BODY, value_w) if note else []
 
     # Calculate height
     y = pad
-    y += int(TITLE_SIZE * 1.4)
+    y += TITLE_LINE_H
     
     # Add subtitle if business name is different from title
     if subtitle and subtitle != title:
-        y += int(BODY_SIZE * 1.2)
+        y += SUBTITLE_LINE_H
     
     for _ in addr_lines:
-        y += int(SMALL_SIZE * 1.3)
+        y += SMALL_LINE_H
     y += HEADER_GAP
-    y += int(BODY_SIZE * 1.4)
+    y += BODY_CENTER_LINE_H
     y += LINE_H * (2 + max(len(party_lines), 1) + 2)
     if ref_lines:
         y += LINE_H * len(ref_lines)
@@ -1099,25 +1256,27 @@ def render_quick_receipt_bitmap(
 
     total_h = y + pad
 
-    # Create actual image
-    img = Image.new("RGB", (width_px, total_h), color=(255, 255, 255))
+    # Create actual image. Thermal paper is black on white: an 8-bit
+    # grayscale canvas is a third of the bytes of RGB for every glyph blit
+    # and for the PNG encoder
+    img = Image.new("L", (width_px, total_h), color=255)
     draw = ImageDraw.Draw(img)
     y = pad
 
     # Header with reduced spacing
     y = _draw_center(draw, x0, content_w, y, title, FONT_TITLE)
-    y += int(SMALL_SIZE * 0.5)
+    y += TITLE_GAP
     
     # Draw subtitle (business model name) if different from title
     if subtitle and subtitle != title:
         y = _draw_center(draw, x0, content_w, y, subtitle, FONT_BODY)
-        y += int(SMALL_SIZE * 0.3)
+        y += ADDR_GAP
     
     for line in addr_lines:
         y = _draw_center(draw, x0, content_w, y, line, FONT_SMALL)
-        y += int(SMALL_SIZE * 0.3)
+        y += ADDR_GAP
     
-    y += int(HEADER_GAP * 0.7)
+    y += HEADER_GAP_DRAWN
 
     # Dynamic Title: "Receipt" for IN, "Payment Voucher" for OUT
     receipt_title = "Receipt"
@@ -1191,14 +1350,16 @@ def render_quick_receipt_bitmap(
         )
 
     # Footer
-    y = _draw_center(draw, x0, content_w, y, "Developed by QONKAR TECHNOLOGIES", FONT_SMALL)
-    y = _draw_center(draw, x0, content_w, y, "Contact: 03058214945  |  www.qonkar.com", FONT_SMALL)
+    y = _draw_label_center(draw, x0, content_w, y, "Developed by QONKAR TECHNOLOGIES", FONT_SMALL)
+    y = _draw_label_center(draw, x0, content_w, y, "Contact: 03058214945  |  www.qonkar.com", FONT_SMALL)
 
     # Save image
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / f"quick_receipt_{getattr(payment, 'id', 'X')}.png"
-    img.save(out_path)
+    # Printed straight from disk by the caller, so written synchronously;
+    # fast zlib level since the file only lives until it is printed
+    img.save(out_path, format="PNG", compress_level=1)
     
     if debug:
         print(f"[OK] Quick receipt saved: {out_path}")
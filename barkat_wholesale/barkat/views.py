@@ -6131,18 +6131,16 @@ def finance_reports(request):
     if business:
         exp_filter &= Q(business=business)
 
-    expense_total_all = Expense.objects.filter(exp_filter).aggregate(
-        s=Coalesce(Sum("amount", output_field=DecimalField(max_digits=18, decimal_places=2)), D0)
-    )["s"]
-
     # --- NEW: Landed PO Expenses vs Operating Expenses ---
-    landed_po_expenses_total = Expense.objects.filter(exp_filter, purchase_order__isnull=False).aggregate(
-        s=Coalesce(Sum("amount", output_field=DecimalField(max_digits=18, decimal_places=2)), D0)
-    )["s"] or D0
-
-    operating_expenses_total = Expense.objects.filter(exp_filter, purchase_order__isnull=True).aggregate(
-        s=Coalesce(Sum("amount", output_field=DecimalField(max_digits=18, decimal_places=2)), D0)
-    )["s"] or D0
+    # One pass over the period's expenses for the total and both splits
+    exp_totals = Expense.objects.filter(exp_filter).aggregate(
+        all=Coalesce(Sum("amount", output_field=DecimalField(max_digits=18, decimal_places=2)), D0),
+        landed=Coalesce(Sum("amount", filter=Q(purchase_order__isnull=False), output_field=DecimalField(max_digits=18, decimal_places=2)), D0),
+        operating=Coalesce(Sum("amount", filter=Q(purchase_order__isnull=True), output_field=DecimalField(max_digits=18, decimal_places=2)), D0),
+    )
+    expense_total_all = exp_totals["all"]
+    landed_po_expenses_total = exp_totals["landed"]
+    operating_expenses_total = exp_totals["operating"]
 
     # For backward compatibility in case old code expects expense_total
     expense_total = expense_total_all
@@ -6977,12 +6975,6 @@ def finance_reports(request):
     
     # Net Profit = Gross Profit - Non-PO Operating Expenses
     # (PO-linked expenses are already in COGS via landed cost)
-    operating_expenses_total = Expense.objects.filter(
-        exp_filter & Q(purchase_order__isnull=True)
-    ).aggregate(
-        s=Coalesce(Sum("amount", output_field=DecimalField(max_digits=18, decimal_places=2)), D0)
-    )["s"] or D0
-    
     net_profit = gross_profit - operating_expenses_total
     
     # Product-wise Profit Breakdown
@@ -7045,7 +7037,6 @@ def finance_reports(request):
         "kpi_revenue": revenue_total,
         "kpi_cogs": cogs_total,
         "kpi_gross_profit": gross_profit,
-        "kpi_operating_expenses": operating_expenses_total,
         "kpi_net_profit": net_profit,
         "product_profit_rows": product_profit_rows,
         "kpi_cash_sale_profit": cash_sale_profit,
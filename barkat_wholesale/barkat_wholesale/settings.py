@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
 # Load .env file if it exists (optional)
@@ -131,6 +132,47 @@ DATABASES = {
 #     }
 # }
 
+# Cache
+# The report data version and ledger version (barkat.signals) must be seen by
+# every process: the server, its workers and the management commands. Set
+# REDIS_URL to use Redis; otherwise a file cache under BASE_DIR/cache is
+# shared by all processes on this machine.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache',
+        }
+    }
+
+# Tests: build the schema straight from the models instead of replaying every
+# migration. Run with `python manage.py test barkat --keepdb` to reuse it.
+if sys.argv[1:2] == ['test']:
+    class DisableMigrations:
+        def __contains__(self, item):
+            return True
+
+        def __getitem__(self, item):
+            return None
+
+    MIGRATION_MODULES = DisableMigrations()
+
+    # A cache of its own: the test database's balances must never reach the
+    # live server, and tests clear it freely
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': BASE_DIR / 'cache' / 'test',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators